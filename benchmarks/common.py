@@ -0,0 +1,80 @@
+"""
+Helpers shared by the benchmark and stress scripts.
+
+The scripts boot `src.main:app` in-process and drive it through an ASGI client,
+so no server has to be running. Unless DATABASE_NAME is already set, they run
+against a throw-away SQLite file. This module must be imported before anything
+from `src`, because the configuration is read at import time.
+"""
+import os
+import tempfile
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any
+
+if "DATABASE_NAME" not in os.environ:
+    os.environ["DATABASE_DIALECT"] = "sqlite"
+    os.environ["DATABASE_NAME"] = os.path.join(
+        tempfile.mkdtemp(prefix="meeting-bench-"), "bench.sqlite3"
+    )
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+PASSWORD = "benchmark-password"
+
+
+@asynccontextmanager
+async def app_client(**client_kwargs: Any) -> AsyncIterator[tuple[FastAPI, httpx.AsyncClient]]:
+    """
+    Run the application lifespan and yield the app with an ASGI client bound to it.
+    """
+    from src.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", **client_kwargs
+        ) as client:
+            yield app, client
+
+
+async def seed_users(app: FastAPI, count: int, role: str = "user") -> list[dict[str, Any]]:
+    """
+    Insert `count` users straight into the database, skipping the signup route
+    and its bcrypt cost. All of them share the PASSWORD password.
+    """
+    from src.adapters.orm import Role
+    from src.users.orm import User
+    from src.users.utils import get_password_hash
+
+    password = get_password_hash(PASSWORD)
+    prefix = uuid.uuid4().hex[:8]
+    users = [
+        {
+            "user_id": uuid.uuid4(),
+            "username": f"{role}-{i}",
+            "email": f"{role}-{prefix}-{i}@benchmark.dev",
+            "password": password,
+            "role": Role(role),
+        }
+        for i in range(count)
+    ]
+    async with app.container.db_manager().session() as session:
+        await session.execute(insert(User), users)
+        await session.commit()
+    return users
+
+
+async def auth_headers(user: dict[str, Any]) -> dict[str, str]:
+    """
+    Mint an access token for a seeded user, as the login route would.
+    """
+    from src.common.security import security_service
+
+    claims = security_service.token_claims(SimpleNamespace(token_version=0, **user))  # type: ignore[arg-type]
+    token = await security_service.create_access_token(data=claims)
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,131 @@
+"""
+First-byte latency and memory of the streamed registration list.
+
+Seeds one user per list size with that many registrations, then requests
+GET /registrations/ for each of them and reports the time to the first body
+chunk, the time to the last one, the response size and the peak memory
+traced while the request ran. With streaming, first-byte latency and peak
+memory should stay about flat as the list grows:
+
+    python -m benchmarks.list_streaming --sizes 1000 10000 100000
+
+The ASGI app is called directly rather than through httpx, whose ASGI
+transport buffers the whole body before returning the response.
+"""
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import time as clock
+import tracemalloc
+from typing import Any
+
+# Seeding inserts large batches; do not log them as slow queries.
+os.environ["DATABASE_SLOW_QUERY_THRESHOLD"] = "0"
+
+from benchmarks.common import app_client, auth_headers, seed_users  # noqa: E402
+from benchmarks.routes import _insert_events  # noqa: E402
+
+
+async def _get(app: Any, path: str, headers: dict[str, str]) -> tuple[int, float, float, int]:
+    """
+    Send one GET request to the ASGI app and return the status, the seconds to
+    the first and to the last body chunk, and the body size in bytes.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("benchmark", 80),
+        "client": ("127.0.0.1", 12345),
+        "root_path": "",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "app": app,
+    }
+    status, first, size = 0, 0.0, 0
+    request_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive() -> dict[str, Any]:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Streaming responses listen for a disconnect until they are done.
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status, first, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            if not first:
+                first = clock.perf_counter() - started
+            size += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_complete.set()
+
+    started = clock.perf_counter()
+    await app(scope, receive, send)
+    return status, first, clock.perf_counter() - started, size
+
+
+async def _insert_registrations(app: Any, user_id: Any, event_ids: list[int]) -> None:
+    # Only the list is read, so the events' registration counts are left as they are.
+    from sqlalchemy import insert
+
+    from src.events.orm import EventRegistration
+
+    async with app.container.db_manager().session() as session:
+        await session.execute(
+            insert(EventRegistration),
+            [{"user_id": user_id, "event_id": event_id} for event_id in event_ids],
+        )
+        await session.commit()
+
+
+async def run(sizes: list[int]) -> int:
+    async with app_client() as (app, _):
+        organizer, *_ = await seed_users(app, 1, role="organizer")
+        users = await seed_users(app, len(sizes))
+        event_ids = await _insert_events(app, max(sizes), organizer["user_id"], "Streaming")
+        for user, size in zip(users, sizes):
+            await _insert_registrations(app, user["user_id"], event_ids[:size])
+
+        print(f"  {'rows':>8} {'first byte ms':>14} {'total ms':>9} {'MiB sent':>9} {'peak MiB':>9}")
+        failed = False
+        for user, size in zip(users, sizes):
+            headers = await auth_headers(user)
+            # Warm up the route and the principal lookup before measuring.
+            await _get(app, "/registrations/", headers)
+            status, first, total, sent = await _get(app, "/registrations/", headers)
+
+            gc.collect()
+            tracemalloc.start()
+            await _get(app, "/registrations/", headers)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            failed |= status != 200
+            print(f"  {size:>8} {first * 1000:>14.1f} {total * 1000:>9.1f} "
+                  f"{sent / 2**20:>9.2f} {peak / 2**20:>9.2f}"
+                  + ("" if status == 200 else f"  status {status}"))
+    return 1 if failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(sorted(args.sizes))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Query budget check.
+
+Walks through the main user journeys against the in-process application in
+debug mode and reads the number of statements each request executed from the
+X-DB-Query-Count header. Caches are disabled, so every request reaches the
+database. A request that executes more statements than its budget makes the
+script exit with status 1, so it can run in CI:
+
+    python -m benchmarks.query_budget
+
+When a change legitimately needs more statements, raise the budget here in
+the same commit, so the increase is visible in review.
+"""
+import asyncio
+import os
+import sys
+from datetime import date, timedelta
+
+os.environ["DEBUG"] = "true"
+os.environ["EVENT_CACHE_SIZE"] = "0"
+os.environ["EVENT_PAGE_CACHE_SIZE"] = "0"
+os.environ["PRINCIPAL_CACHE_SIZE"] = "0"
+
+from benchmarks.common import app_client, auth_headers, seed_users  # noqa: E402
+
+# Maximum statements per request, including the lookup of the current user.
+BUDGETS = {
+    "create event": 2,
+    "list events": 1,
+    "read event": 1,
+    # Registration writes also add to the hourly stats, one upsert each.
+    "register": 5,
+    # A full event is locked and the seat retried before joining the waitlist.
+    "join waitlist": 7,
+    "list registrations": 3,
+    "cancel registration": 13,
+    # The event's author is checked before the stats are read.
+    "event stats": 4,
+    "update event": 5,
+    "read profile": 2,
+    "delete event": 3,
+}
+
+
+async def run() -> int:
+    from src.common.query_stats import QUERY_COUNT_HEADER, QUERY_TIME_HEADER
+
+    over_budget: list[str] = []
+
+    async with app_client() as (app, client):
+        organizer, *_ = await seed_users(app, 1, role="organizer")
+        first, second = await seed_users(app, 2)
+        organizer_headers = await auth_headers(organizer)
+        first_headers = await auth_headers(first)
+        second_headers = await auth_headers(second)
+
+        async def step(name: str, method: str, url: str, headers: dict, **kwargs) -> dict:
+            response = await client.request(method, url, headers=headers, **kwargs)
+            if response.is_error:
+                raise RuntimeError(f"{name}: {response.status_code} {response.text}")
+            count = int(response.headers[QUERY_COUNT_HEADER])
+            budget = BUDGETS[name]
+            outcome = "ok" if count <= budget else "OVER BUDGET"
+            print(f"  {name:<22} {count:>3} / {budget:<3} "
+                  f"{response.headers[QUERY_TIME_HEADER]:>7} ms  {outcome}")
+            if count > budget:
+                over_budget.append(name)
+            return response.json() if response.content else {}
+
+        event = {
+            "title": "Query budget",
+            "event_date": (date.today() + timedelta(days=7)).isoformat(),
+            "location": "Kyiv",
+            "organizer": "Budget",
+            "capacity": 1,
+        }
+        print(f"  {'request':<22} statements / budget")
+        created = await step("create event", "POST", "/events/create", organizer_headers, json=event)
+        event_id = created["event_id"]
+        await step("list events", "GET", "/events/", {})
+        await step("read event", "GET", f"/events/{event_id}", {})
+        registration = await step(
+            "register", "POST", "/registrations/create", first_headers,
+            json={"event_id": event_id},
+        )
+        await step(
+            "join waitlist", "POST", "/registrations/create", second_headers,
+            json={"event_id": event_id},
+        )
+        await step("list registrations", "GET", "/registrations/", first_headers)
+        await step(
+            "cancel registration", "DELETE", f"/registrations/{registration['id']}", first_headers
+        )
+        await step("event stats", "GET", f"/events/{event_id}/stats", organizer_headers)
+        await step(
+            "update event", "PUT", f"/events/{event_id}", organizer_headers,
+            json={**event, "capacity": 2},
+        )
+        await step("read profile", "GET", "/users/me", first_headers)
+        await step("delete event", "DELETE", f"/events/{event_id}/delete", organizer_headers)
+
+    if over_budget:
+        print(f"Over budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run()))
@@ -0,0 +1,108 @@
+"""
+Contention benchmark for seat allocation.
+
+Creates one event with a small capacity and fires a registration request from
+every client at once, then reports registrations per second and checks the
+outcome: exactly `capacity` registrations, everybody else on the waitlist in
+order, and waiting users promoted as registrations are deleted. Overselling or
+any unexpected response makes the script exit with status 1.
+
+    python -m benchmarks.registration_contention --clients 1000 --capacity 100
+"""
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+from benchmarks.common import app_client, auth_headers, seed_users
+
+from sqlalchemy import func, select
+
+
+async def run(clients: int, capacity: int, cancellations: int) -> int:
+    from src.events.orm import Event, EventRegistration, EventWaitlistEntry
+
+    async with app_client(timeout=None) as (app, client):
+        organizer, *_ = await seed_users(app, 1, role="organizer")
+        users = await seed_users(app, clients)
+        headers = [await auth_headers(user) for user in users]
+
+        response = await client.post(
+            "/events/create",
+            json={
+                "title": "Flash sale",
+                "event_date": (date.today() + timedelta(days=30)).isoformat(),
+                "location": "Kyiv",
+                "organizer": "Benchmark",
+                "capacity": capacity,
+            },
+            headers=await auth_headers(organizer),
+        )
+        event_id = response.json()["event_id"]
+
+        async def register(user_headers: dict[str, str]) -> tuple[int, dict]:
+            response = await client.post(
+                "/registrations/create", json={"event_id": event_id}, headers=user_headers
+            )
+            return response.status_code, response.json()
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*map(register, headers))
+        elapsed = time.perf_counter() - started
+
+        statuses = Counter(status for status, _ in results)
+        print(f"{clients} concurrent clients, capacity {capacity}")
+        print(f"  {elapsed:.2f}s, {clients / elapsed:.0f} requests/s, "
+              f"{statuses[201] / elapsed:.0f} registrations/s")
+        print(f"  responses: {dict(statuses)}")
+
+        errors: list[str] = []
+        if statuses[201] != min(capacity, clients):
+            errors.append(f"expected {min(capacity, clients)} registrations, got {statuses[201]}")
+        if statuses[202] != max(clients - capacity, 0):
+            errors.append(f"expected {max(clients - capacity, 0)} waitlisted, got {statuses[202]}")
+        positions = sorted(body["position"] for status, body in results if status == 202)
+        if positions != list(range(1, len(positions) + 1)):
+            errors.append("waitlist positions are not a gapless 1..n sequence")
+
+        # Free some seats and check that the head of the waitlist moves up.
+        registered = [
+            (body["id"], user_headers)
+            for (status, body), user_headers in zip(results, headers)
+            if status == 201
+        ]
+        for registration_id, user_headers in registered[:cancellations]:
+            await client.delete(f"/registrations/{registration_id}", headers=user_headers)
+
+        async with app.container.db_manager().session() as session:
+            count = await session.scalar(select(Event.registrations_count).filter_by(event_id=event_id))
+            rows = await session.scalar(
+                select(func.count()).select_from(EventRegistration).filter_by(event_id=event_id)
+            )
+            waiting = await session.scalar(
+                select(func.count()).select_from(EventWaitlistEntry).filter_by(event_id=event_id)
+            )
+        print(f"  after {cancellations} cancellations: {rows} registered, {waiting} waiting")
+        if not count == rows == min(capacity, clients):
+            errors.append(f"registrations_count {count} and {rows} rows for capacity {capacity}")
+        if waiting != max(clients - capacity - cancellations, 0):
+            errors.append(f"{waiting} users still waiting after promotions")
+
+    for error in errors:
+        print(f"  {error}")
+    return 1 if errors else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--capacity", type=int, default=100)
+    parser.add_argument("--cancellations", type=int, default=10)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.clients, args.capacity, args.cancellations)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Read-replica routing check with two local SQLite files.
+
+The primary and the replica are separate files; "replication" is a snapshot
+of the primary copied over the replica on demand, so the replica lags until
+the next copy. The script checks that reads are served by the replica, that
+reads right after a write go to the primary for the read-your-writes window,
+and that they go back to the replica once the window is over. Any mismatch
+makes the script exit with status 1.
+
+    python -m benchmarks.replica_routing --window 0.5
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import date, timedelta
+
+WORKDIR = tempfile.mkdtemp(prefix="meeting-replica-")
+PRIMARY = os.path.join(WORKDIR, "primary.sqlite3")
+REPLICA = os.path.join(WORKDIR, "replica.sqlite3")
+
+
+def configure(window: float) -> None:
+    # Must run before anything from `src` is imported.
+    os.environ["DATABASE_DIALECT"] = "sqlite"
+    os.environ["DATABASE_NAME"] = PRIMARY
+    os.environ["DATABASE_REPLICA_URLS"] = f"sqlite+aiosqlite:///{REPLICA}"
+    os.environ["DATABASE_READ_YOUR_WRITES_WINDOW"] = str(window)
+    # Served from the cache, reads would never reach either database.
+    os.environ["EVENT_CACHE_SIZE"] = "0"
+    os.environ["EVENT_PAGE_CACHE_SIZE"] = "0"
+
+
+def create_schema() -> None:
+    from sqlalchemy import create_engine
+
+    import src.main  # noqa: F401  Registers every model on the metadata.
+    from src.adapters.orm import SqlAlchemyBase
+
+    engine = create_engine(f"sqlite:///{PRIMARY}")
+    SqlAlchemyBase.metadata.create_all(engine)
+    engine.dispose()
+
+
+def replicate() -> None:
+    with sqlite3.connect(PRIMARY) as source, sqlite3.connect(REPLICA) as target:
+        source.backup(target)
+
+
+async def run(window: float) -> int:
+    from benchmarks.common import app_client, auth_headers, seed_users
+
+    # The replica needs the schema before the app reads from it.
+    create_schema()
+    replicate()
+    failures: list[str] = []
+
+    def check(label: str, status: int, expected: int) -> None:
+        outcome = "ok" if status == expected else "FAILED"
+        print(f"  {label}: {status} (expected {expected}) {outcome}")
+        if status != expected:
+            failures.append(label)
+
+    async with app_client() as (app, client):
+        organizer, *_ = await seed_users(app, 1, role="organizer")
+        headers = await auth_headers(organizer)
+        replicate()  # Seeding bypasses the units of work and their window.
+
+        async def create_event(title: str) -> int:
+            response = await client.post(
+                "/events/create",
+                json={
+                    "title": title,
+                    "event_date": (date.today() + timedelta(days=7)).isoformat(),
+                    "location": "Kyiv",
+                    "organizer": "Replica check",
+                },
+                headers=headers,
+            )
+            response.raise_for_status()
+            return response.json()["event_id"]
+
+        async def read_event(event_id: int) -> int:
+            return (await client.get(f"/events/{event_id}")).status_code
+
+        replicated = await create_event("Replicated")
+        replicate()
+        pending = await create_event("Not replicated yet")
+
+        print(f"primary: {PRIMARY}\nreplica: {REPLICA}\nwindow:  {window}s")
+        check("read inside the window (primary)", await read_event(pending), 200)
+
+        await asyncio.sleep(window * 1.5)
+        check("lagging replica after the window", await read_event(pending), 404)
+        check("replicated row after the window", await read_event(replicated), 200)
+
+        replicate()
+        check("replica after catching up", await read_event(pending), 200)
+
+    return 1 if failures else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--window", type=float, default=0.5,
+                        help="read-your-writes window in seconds")
+    args = parser.parse_args()
+    configure(args.window)
+    sys.exit(asyncio.run(run(args.window)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Repository projection micro-benchmark.
+
+Seeds a large events table and loads it through EventsRepository.get_all
+twice: once with column projection (rows validated straight from the
+selected columns) and once with ORM hydration (projection off, Event
+instances built first). Each mode is timed over several rounds for rows per
+second, then run once more under tracemalloc for peak memory and the number
+of allocated blocks.
+
+    python -m benchmarks.repository_projection --rows 100000 --rounds 3
+"""
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import time as clock
+import tracemalloc
+from datetime import date, datetime, time, timedelta
+
+# Loading the whole table is slow by design; do not log it as a slow query.
+os.environ["DATABASE_SLOW_QUERY_THRESHOLD"] = "0"
+
+from benchmarks.common import app_client, seed_users  # noqa: E402
+
+
+async def _insert_events(app, rows: int, author_id) -> None:
+    from sqlalchemy import insert
+
+    from src.events.orm import Event
+
+    day = datetime.combine(date.today(), time.min)
+    events = [
+        {
+            "title": f"Projection {i}",
+            "description": "Seeded for the projection benchmark",
+            "event_date": day + timedelta(days=i % 365),
+            "location": "Kyiv",
+            "organizer": "Benchmark",
+            "author_id": author_id,
+            "capacity": 100,
+        }
+        for i in range(rows)
+    ]
+    async with app.container.db_manager().session() as session:
+        for start in range(0, rows, 10_000):
+            await session.execute(insert(Event), events[start:start + 10_000])
+        await session.commit()
+
+
+async def _load(app, repository: type) -> list:
+    async with app.container.db_manager().session() as session:
+        return await repository(session).get_all()
+
+
+async def _measure(app, repository: type, rounds: int) -> tuple[int, float, float, int]:
+    loaded = 0
+    best = float("inf")
+    for _ in range(rounds):
+        gc.collect()
+        started = clock.perf_counter()
+        loaded = len(await _load(app, repository))
+        best = min(best, clock.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    result = await _load(app, repository)
+    blocks = sys.getallocatedblocks() - blocks
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return loaded, best, peak, blocks
+
+
+async def run(rows: int, rounds: int) -> int:
+    from src.events.repository import EventsRepository
+
+    class HydratingEventsRepository(EventsRepository):
+        projection = False
+
+    async with app_client() as (app, _):
+        author, *_ = await seed_users(app, 1, role="organizer")
+        await _insert_events(app, rows, author["user_id"])
+
+        print(f"  {'mode':<12} {'rows':>8} {'best s':>8} {'rows/s':>10} "
+              f"{'peak MiB':>9} {'blocks kept':>12}")
+        results = {}
+        for mode, repository in (
+            ("hydration", HydratingEventsRepository),
+            ("projection", EventsRepository),
+        ):
+            loaded, seconds, peak, blocks = await _measure(app, repository, rounds)
+            results[mode] = loaded / seconds
+            print(f"  {mode:<12} {loaded:>8} {seconds:>8.3f} {loaded / seconds:>10.0f} "
+                  f"{peak / 2**20:>9.1f} {blocks:>12}")
+
+    print(f"Projection speed-up: {results['projection'] / results['hydration']:.2f}x")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.rows, args.rounds)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+Latency and throughput of every route.
+
+Seeds users, events and registrations, then sends `--requests` requests to
+each route of the auth, users, events and registrations routers with
+`--concurrency` of them in flight, and reports throughput and p50/p95/p99
+latency per route. Results can be saved as JSON and compared with a saved
+baseline:
+
+    python -m benchmarks.routes --output baseline.json
+    python -m benchmarks.routes --baseline baseline.json --max-regression 0.2
+
+With --max-regression, a route whose p95 latency grew by more than that
+fraction over the baseline (and by over a millisecond) makes the script
+exit with status 1. Routes that
+create or delete resources get fresh ones for every request, so each run
+measures the same work. Runs on a temporary SQLite database unless
+DATABASE_NAME (and the other DATABASE_* variables) point elsewhere.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import sys
+import time as clock
+import uuid
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Any
+
+from benchmarks.common import PASSWORD, app_client, auth_headers, seed_users
+
+from fastapi import FastAPI
+from sqlalchemy import insert
+
+RequestSpec = dict[str, Any]
+
+# p95 changes smaller than this are noise, whatever the ratio.
+NOISE_FLOOR_MS = 1.0
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    method: str
+    path: str
+    build: Callable[[int], RequestSpec]
+    expect: tuple[int, ...]
+
+
+@dataclass
+class RouteResult:
+    requests: int
+    errors: int
+    throughput: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+async def _insert_events(app: FastAPI, count: int, author_id: uuid.UUID, title: str) -> list[int]:
+    from src.events.orm import Event
+
+    first_day = date.today() + timedelta(days=30)
+    rows = [
+        {
+            "title": f"{title} {i}",
+            "event_date": datetime.combine(first_day + timedelta(days=i % 365), time.min),
+            "location": ("Kyiv", "Lviv", "Odesa")[i % 3],
+            "organizer": "Benchmark",
+            "author_id": author_id,
+        }
+        for i in range(count)
+    ]
+    async with app.container.db_manager().session() as session:
+        result = await session.execute(
+            insert(Event).returning(Event.event_id, sort_by_parameter_order=True), rows
+        )
+        await session.commit()
+        return list(result.scalars())
+
+
+async def _insert_registrations(
+    app: FastAPI, pairs: list[tuple[uuid.UUID, int]]
+) -> list[int]:
+    from src.events.orm import Event, EventRegistration
+
+    async with app.container.db_manager().session() as session:
+        result = await session.execute(
+            insert(EventRegistration).returning(
+                EventRegistration.id, sort_by_parameter_order=True
+            ),
+            [{"user_id": user_id, "event_id": event_id} for user_id, event_id in pairs],
+        )
+        ids = list(result.scalars())
+        for event_id in {event_id for _, event_id in pairs}:
+            count = sum(1 for _, other in pairs if other == event_id)
+            await session.execute(
+                Event.__table__.update()
+                .where(Event.event_id == event_id)
+                .values(registrations_count=Event.registrations_count + count)
+            )
+        await session.commit()
+        return ids
+
+
+async def build_scenarios(app: FastAPI, requests: int, user_count: int) -> list[Scenario]:
+    """
+    Seed what the scenarios need and return them in the order they run:
+    reads first, then writes, then the routes that delete or revoke.
+    """
+    run = uuid.uuid4().hex[:8]
+    organizer, *_ = await seed_users(app, 1, role="organizer")
+    users = await seed_users(app, user_count)
+    doomed_users = await seed_users(app, requests)
+    headers = [await auth_headers(user) for user in users]
+    organizer_headers = await auth_headers(organizer)
+    author = organizer["user_id"]
+
+    listed = await _insert_events(app, 200, author, "Listed")
+    per_user = math.ceil(requests / user_count)
+    register_events = await _insert_events(app, per_user, author, "Register")
+    cancel_events = await _insert_events(app, per_user, author, "Cancel")
+    import_events = await _insert_events(app, requests, author, "Import")
+    doomed_events = await _insert_events(app, requests, author, "Doomed")
+    export_event, *_ = await _insert_events(app, 1, author, "Export")
+
+    def pair(i: int, events: list[int]) -> tuple[uuid.UUID, int]:
+        return users[i % user_count]["user_id"], events[i // user_count]
+
+    cancellations = await _insert_registrations(
+        app, [pair(i, cancel_events) for i in range(requests)]
+    )
+    await _insert_registrations(app, [(user["user_id"], export_event) for user in users])
+    await _insert_registrations(app, [(user["user_id"], listed[0]) for user in users])
+
+    csv = "email\n" + "\n".join(user["email"] for user in users[:50]) + "\n"
+    event_date = (date.today() + timedelta(days=60)).isoformat()
+
+    def event_body(i: int) -> dict[str, Any]:
+        return {
+            "title": f"Benchmark {i}",
+            "event_date": event_date,
+            "location": "Kyiv",
+            "organizer": "Benchmark",
+        }
+
+    def user_headers(i: int) -> dict[str, str]:
+        return headers[i % user_count]
+
+    return [
+        Scenario("auth.signup_user", "POST", "/auth/signup_user", lambda i: {
+            "url": "/auth/signup_user",
+            "json": {"username": "Signup", "email": f"signup-{run}-{i}@benchmark.dev",
+                     "phone": f"+{int(run, 16)}{i:06d}", "password": PASSWORD},
+        }, (201,)),
+        Scenario("auth.login", "POST", "/auth/login", lambda i: {
+            "url": "/auth/login",
+            "data": {"username": users[i % user_count]["email"], "password": PASSWORD},
+        }, (200,)),
+        Scenario("auth.logout", "GET", "/auth/logout", lambda i: {
+            "url": "/auth/logout",
+        }, (302,)),
+        Scenario("users.read_me", "GET", "/users/me", lambda i: {
+            "url": "/users/me", "headers": user_headers(i),
+        }, (200,)),
+        Scenario("users.update", "PUT", "/users/{user_id}", lambda i: {
+            "url": f"/users/{users[i % user_count]['user_id']}",
+            "json": {"username": f"Renamed {i}"},
+        }, (200,)),
+        Scenario("events.list", "GET", "/events/", lambda i: {
+            "url": "/events/",
+            "params": ({}, {"location": "Kyiv"}, {"organizer": "Benchmark", "limit": 50})[i % 3],
+        }, (200,)),
+        Scenario("events.search", "GET", "/events/search", lambda i: {
+            "url": "/events/search",
+            "params": {"q": ("listed", "lviv bench", f"listed {i % 200}")[i % 3]},
+        }, (200,)),
+        Scenario("events.read", "GET", "/events/{event_id}", lambda i: {
+            "url": f"/events/{listed[i % len(listed)]}",
+        }, (200,)),
+        Scenario("events.export", "GET", "/events/{event_id}/registrations/export", lambda i: {
+            "url": f"/events/{export_event}/registrations/export",
+            "params": {"format": ("ndjson", "csv")[i % 2]},
+            "headers": organizer_headers,
+        }, (200,)),
+        Scenario("events.stats", "GET", "/events/{event_id}/stats", lambda i: {
+            "url": f"/events/{register_events[i % len(register_events)]}/stats",
+            "headers": organizer_headers,
+        }, (200,)),
+        Scenario("registrations.list", "GET", "/registrations/", lambda i: {
+            "url": "/registrations/", "headers": user_headers(i),
+        }, (200,)),
+        Scenario("events.create", "POST", "/events/create", lambda i: {
+            "url": "/events/create", "json": event_body(i), "headers": organizer_headers,
+        }, (201,)),
+        Scenario("events.bulk", "POST", "/events/bulk", lambda i: {
+            "url": "/events/bulk",
+            "json": {"events": [event_body(i * 10 + n) for n in range(10)]},
+            "headers": organizer_headers,
+        }, (201,)),
+        Scenario("events.update", "PUT", "/events/{event_id}", lambda i: {
+            "url": f"/events/{listed[i % len(listed)]}",
+            "json": {**event_body(i), "capacity": 1000},
+            "headers": organizer_headers,
+        }, (200,)),
+        Scenario("events.import", "POST", "/events/{event_id}/registrations/import", lambda i: {
+            "url": f"/events/{import_events[i]}/registrations/import",
+            "files": {"file": ("attendees.csv", csv, "text/csv")},
+            "headers": organizer_headers,
+        }, (200,)),
+        Scenario("registrations.create", "POST", "/registrations/create", lambda i: {
+            "url": "/registrations/create",
+            "json": {"event_id": pair(i, register_events)[1]},
+            "headers": user_headers(i),
+        }, (201,)),
+        Scenario("registrations.delete", "DELETE", "/registrations/{registration_id}", lambda i: {
+            "url": f"/registrations/{cancellations[i]}", "headers": user_headers(i),
+        }, (204,)),
+        Scenario("events.delete", "DELETE", "/events/{event_id}/delete", lambda i: {
+            "url": f"/events/{doomed_events[i]}/delete", "headers": organizer_headers,
+        }, (204,)),
+        Scenario("users.delete", "DELETE", "/users/{user_id}/delete", lambda i: {
+            "url": f"/users/{doomed_users[i]['user_id']}/delete",
+        }, (204,)),
+        # Last: in stateless auth mode it invalidates the tokens used above.
+        Scenario("users.revoke_tokens", "POST", "/users/me/revoke_tokens", lambda i: {
+            "url": "/users/me/revoke_tokens", "headers": user_headers(i),
+        }, (204,)),
+    ]
+
+
+async def measure(client: Any, scenario: Scenario, requests: int, concurrency: int) -> RouteResult:
+    latencies: list[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal errors, next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            spec = scenario.build(index)
+            started = clock.perf_counter()
+            response = await client.request(scenario.method, **spec)
+            latencies.append(clock.perf_counter() - started)
+            if response.status_code not in scenario.expect:
+                errors += 1
+                if errors == 1:
+                    print(f"  {scenario.name}: unexpected {response.status_code} "
+                          f"{response.text[:200]}", file=sys.stderr)
+
+    started = clock.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    elapsed = clock.perf_counter() - started
+
+    latencies.sort()
+    return RouteResult(
+        requests=requests,
+        errors=errors,
+        throughput=requests / elapsed,
+        mean_ms=sum(latencies) / len(latencies) * 1000,
+        p50_ms=percentile(latencies, 0.50) * 1000,
+        p95_ms=percentile(latencies, 0.95) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+    )
+
+
+def compare(
+    results: dict[str, RouteResult], baseline: dict[str, Any], max_regression: float | None
+) -> list[str]:
+    """
+    Print the change of every route against the baseline and return the
+    routes whose p95 grew by more than `max_regression`, and by more than
+    NOISE_FLOOR_MS.
+    """
+    regressions: list[str] = []
+    print(f"\n{'route':<24} {'req/s':>14} {'p95 ms':>16}")
+    for name, result in results.items():
+        before = baseline.get("routes", {}).get(name)
+        if before is None:
+            print(f"{name:<24} {'new':>14}")
+            continue
+        throughput = result.throughput / before["throughput"] - 1
+        p95 = result.p95_ms / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        flag = ""
+        grew_ms = result.p95_ms - before["p95_ms"]
+        if max_regression is not None and p95 > max_regression and grew_ms > NOISE_FLOOR_MS:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<24} {throughput:>+13.1%} {p95:>+15.1%}{flag}")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> int:
+    async with app_client(timeout=None) as (app, client):
+        from src.config.db_config import database_config
+
+        scenarios = await build_scenarios(app, args.requests, args.users)
+        if args.only:
+            scenarios = [s for s in scenarios if any(s.name.startswith(p) for p in args.only)]
+
+        results: dict[str, RouteResult] = {}
+        print(f"{'route':<24} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for scenario in scenarios:
+            result = await measure(client, scenario, args.requests, args.concurrency)
+            results[scenario.name] = result
+            print(f"{scenario.name:<24} {result.throughput:>8.0f} {result.p50_ms:>8.1f} "
+                  f"{result.p95_ms:>8.1f} {result.p99_ms:>8.1f} {result.errors:>7}")
+
+    report = {
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "dialect": str(database_config.DATABASE_DIALECT),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "users": args.users,
+        "routes": {
+            name: {"method": s.method, "path": s.path, **asdict(results[name])}
+            for s in scenarios
+            for name in [s.name]
+        },
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nSaved to {args.output}")
+
+    status = 1 if any(result.errors for result in results.values()) else 0
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print(f"\np95 regressions over {args.max_regression:.0%}: {', '.join(regressions)}")
+            status = 1
+    return status
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=20, help="requests in flight")
+    parser.add_argument("--users", type=int, default=100, help="seeded users sending requests")
+    parser.add_argument("--only", nargs="*", help="route name prefixes, e.g. events. auth.login")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with results saved by --output")
+    parser.add_argument("--max-regression", type=float,
+                        help="fail when p95 grows by more than this fraction, e.g. 0.2")
+    args = parser.parse_args()
+    if os.environ.get("DATABASE_DIALECT", "sqlite") == "sqlite" and args.concurrency > 50:
+        print("SQLite serializes writers; expect write routes to queue.", file=sys.stderr)
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
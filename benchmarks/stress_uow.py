@@ -0,0 +1,96 @@
+"""
+Concurrency stress check for request-scoped units of work.
+
+Fires hundreds of parallel authenticated requests at the ASGI app and checks
+that every response belongs to the caller: each user must see their own
+profile and only their own registration. Any cross-talk between sessions,
+or any request failing under load, makes the script exit with status 1.
+
+    python -m benchmarks.stress_uow --users 200 --requests 1000
+"""
+import argparse
+import asyncio
+import random
+import sys
+from datetime import datetime, timedelta
+
+from benchmarks.common import app_client, auth_headers, seed_users
+
+from sqlalchemy import insert
+
+
+async def run(users_count: int, requests_count: int) -> int:
+    from src.events.orm import Event, EventRegistration
+
+    async with app_client() as (app, client):
+        organizer, *_ = await seed_users(app, 1, role="organizer")
+        users = await seed_users(app, users_count)
+
+        # One event per user and a registration linking them, so each user
+        # has exactly one registration the others must never see.
+        async with app.container.db_manager().session() as session:
+            event_date = datetime.now() + timedelta(days=30)
+            result = await session.execute(
+                insert(Event).returning(Event.event_id),
+                [
+                    {
+                        "title": f"Stress event {i}",
+                        "event_date": event_date,
+                        "location": "Kyiv",
+                        "organizer": "Stress",
+                        "author_id": organizer["user_id"],
+                    }
+                    for i in range(users_count)
+                ],
+            )
+            event_ids = list(result.scalars())
+            await session.execute(
+                insert(EventRegistration),
+                [
+                    {"user_id": user["user_id"], "event_id": event_id}
+                    for user, event_id in zip(users, event_ids)
+                ],
+            )
+            await session.commit()
+
+        expected = {
+            user["email"]: (str(user["user_id"]), event_id)
+            for user, event_id in zip(users, event_ids)
+        }
+        headers = {user["email"]: await auth_headers(user) for user in users}
+
+        async def check(email: str) -> str | None:
+            user_id, event_id = expected[email]
+            if random.random() < 0.5:
+                response = await client.get("/users/me", headers=headers[email])
+                if response.status_code != 200:
+                    return f"/users/me -> {response.status_code} for {email}"
+                if response.json()["user_id"] != user_id:
+                    return f"/users/me returned another user's profile for {email}"
+            else:
+                response = await client.get("/registrations/", headers=headers[email])
+                if response.status_code != 200:
+                    return f"/registrations/ -> {response.status_code} for {email}"
+                if [r["event_id"] for r in response.json()] != [event_id]:
+                    return f"/registrations/ returned another user's data for {email}"
+            return None
+
+        emails = [random.choice(users)["email"] for _ in range(requests_count)]
+        errors = [e for e in await asyncio.gather(*map(check, emails)) if e]
+
+    print(f"{requests_count} parallel requests from {users_count} users, {len(errors)} errors")
+    for error in errors[:20]:
+        print(f"  {error}")
+    return 1 if errors else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.users, args.requests)))
+
+
+if __name__ == "__main__":
+    main()
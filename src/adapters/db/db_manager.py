@@ -1,48 +1,123 @@
-from asyncio import current_task
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from typing import Any
 
 import click
+from sqlalchemy import event, make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
-    async_scoped_session,
     async_sessionmaker,
     create_async_engine,
 )
 
-from src.adapters.orm import SqlAlchemyBase
-from src.config.db_config import database_config as db_config
+from src.adapters.db.instrumentation import instrument_engine
+from src.adapters.db.pool import InstrumentedQueuePool, PoolStats
+from src.adapters.db.replica import ReplicaSessionFactory
+from src.adapters.db.schema import SchemaCheck, ensure_schema
+from src.config.db_config import Dialect, database_config as db_config
+
+
+def _enable_sqlite_wal(dbapi_connection: Any, connection_record: Any) -> None:
+    """
+    Use write-ahead logging, so readers do not block the writer and
+    concurrent registrations queue on the busy timeout instead of failing.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
+def _is_in_memory(db_uri: str) -> bool:
+    """
+    Whether the URI is an in-memory SQLite database, which only lives as long
+    as its connection: SQLAlchemy's default StaticPool shares that single
+    connection, where a queue pool would give each connection an empty database.
+    """
+    url = make_url(db_uri)
+    return url.get_backend_name() == "sqlite" and (
+        url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+    )
 
 
 class AsyncDatabaseSQLAlchemyManager:
-    def __init__(self, db_uri: str) -> None:
+    def __init__(self, db_uri: str, replica_uris: list[str] | None = None) -> None:
         self._db_uri = db_uri
+        self._replica_uris = replica_uris or []
         self._engine: AsyncEngine | None = None
-        self._session_factory: async_scoped_session[AsyncSession] | None = None
+        self._replica_engines: list[AsyncEngine] = []
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._read_session_factory: ReplicaSessionFactory | None = None
 
-    async def create_database(self) -> None:
-        assert self._engine is not None
-        async with self._engine.begin() as conn:
-            await conn.run_sync(SqlAlchemyBase.metadata.create_all)
+    async def ensure_schema(self) -> SchemaCheck:
+        """
+        Apply pending migrations; a single query when the schema is current.
+        """
+        return await ensure_schema(self.engine)
 
     async def connect(self, **kwargs: Any) -> None:
-        self._engine = create_async_engine(self._db_uri, **kwargs)
+        if db_config.DATABASE_DIALECT == Dialect.sqlite:
+            connect_args = {"timeout": db_config.DATABASE_SQLITE_BUSY_TIMEOUT}
+        else:
+            connect_args = {
+                "prepared_statement_cache_size": db_config.DATABASE_STATEMENT_CACHE_SIZE
+            }
+        kwargs.setdefault("connect_args", connect_args)
+        self._engine = self._create_engine(self._db_uri, kwargs)
+        self._replica_engines = [
+            self._create_engine(uri, kwargs) for uri in self._replica_uris
+        ]
+        if db_config.DATABASE_DIALECT == Dialect.sqlite:
+            for engine in (self._engine, *self._replica_engines):
+                event.listen(engine.sync_engine, "connect", _enable_sqlite_wal)
+        instrument_engine(self._engine, "primary")
+        for number, engine in enumerate(self._replica_engines, start=1):
+            instrument_engine(engine, f"replica-{number}")
+
+    @staticmethod
+    def _create_engine(db_uri: str, kwargs: dict[str, Any]) -> AsyncEngine:
+        kwargs = dict(kwargs)
+        if not _is_in_memory(db_uri):
+            kwargs.setdefault("poolclass", InstrumentedQueuePool)
+        if kwargs.get("poolclass") is InstrumentedQueuePool:
+            kwargs.setdefault("pool_size", db_config.DATABASE_POOL_SIZE)
+            kwargs.setdefault("max_overflow", db_config.DATABASE_MAX_OVERFLOW)
+            kwargs.setdefault("pool_timeout", db_config.DATABASE_POOL_TIMEOUT)
+            kwargs.setdefault("pool_recycle", db_config.DATABASE_POOL_RECYCLE)
+            kwargs.setdefault("pool_pre_ping", db_config.DATABASE_POOL_PRE_PING)
+        return create_async_engine(db_uri, **kwargs)
+
+    async def ping(self) -> None:
+        """
+        Open the first pooled connection to the primary, so connection errors
+        surface at startup instead of on the first request.
+        """
+        async with self.engine.connect():
+            pass
 
     async def disconnect(self) -> None:
         assert self._engine is not None
         await self._engine.dispose()
+        for engine in self._replica_engines:
+            await engine.dispose()
 
     def init_session_factory(self) -> None:
-        self._session_factory = async_scoped_session(
-            async_sessionmaker(
-                autocommit=db_config.DATABASE_AUTO_COMMIT,
-                autoflush=db_config.DATABASE_AUTO_FLUSH,
-                expire_on_commit=db_config.DATABASE_EXPIRE_ON_COMMIT,
-                bind=self._engine,
-            ),
-            scopefunc=current_task,
+        # Every call returns a new session; sessions are never shared between
+        # units of work, so concurrent requests cannot close each other's session.
+        self._session_factory = self._make_session_factory(self._engine)
+        self._read_session_factory = ReplicaSessionFactory(
+            primary=self._session_factory,
+            replicas=[self._make_session_factory(e) for e in self._replica_engines],
+            window=db_config.DATABASE_READ_YOUR_WRITES_WINDOW,
+        )
+
+    @staticmethod
+    def _make_session_factory(engine: AsyncEngine | None) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(
+            autocommit=db_config.DATABASE_AUTO_COMMIT,
+            autoflush=db_config.DATABASE_AUTO_FLUSH,
+            expire_on_commit=db_config.DATABASE_EXPIRE_ON_COMMIT,
+            bind=engine,
         )
 
     @asynccontextmanager
@@ -72,12 +147,25 @@ class AsyncDatabaseSQLAlchemyManager:
         finally:
             await session.close()
 
+    def pool_stats(self) -> PoolStats | None:
+        """
+        Live statistics of the connection pool, or None if the engine was
+        created with a pool that does not collect them.
+        """
+        pool = self.engine.pool
+        return pool.stats() if isinstance(pool, InstrumentedQueuePool) else None
+
     @property
     def engine(self) -> AsyncEngine:
         assert self._engine is not None
         return self._engine
 
     @property
-    def session_factory(self) -> async_scoped_session[AsyncSession]:
+    def session_factory(self) -> async_sessionmaker[AsyncSession]:
         assert self._session_factory is not None
         return self._session_factory
+
+    @property
+    def read_session_factory(self) -> ReplicaSessionFactory:
+        assert self._read_session_factory is not None
+        return self._read_session_factory
@@ -0,0 +1,14 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.adapters.orm import SqlAlchemyBase
+from src.config.db_config import Dialect, database_config as db_config
+
+
+def insert(model: type[SqlAlchemyBase]) -> postgresql.Insert | sqlite.Insert:
+    """
+    INSERT construct of the configured dialect. Unlike the generic one it
+    supports ON CONFLICT, via on_conflict_do_nothing / on_conflict_do_update.
+    """
+    if db_config.DATABASE_DIALECT == Dialect.postgresql:
+        return postgresql.insert(model)
+    return sqlite.insert(model)
@@ -0,0 +1,171 @@
+import logging
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.adapters.db.pool import InstrumentedQueuePool, PoolStats
+from src.common.metrics import Sample, db_statement_duration, db_statement_errors, registry
+from src.config.db_config import database_config as db_config
+
+logger = logging.getLogger("uvicorn")
+
+OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+
+# Engines by database label ("primary", "replica-1", ...), for the pool metrics.
+_engines: dict[str, AsyncEngine] = {}
+
+
+@dataclass
+class QueryStats:
+    """
+    Statements executed within one request, or one block of code under
+    track_queries, and the time the database took to run them.
+    """
+
+    route: str = ""
+    count: int = 0
+    seconds: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [(sql, n) for sql, n in self.statements.items() if n >= threshold]
+
+
+# Stats of the code running in the current context, if it is being tracked.
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries(route: str = "") -> Iterator[QueryStats]:
+    """
+    Count the statements executed inside the block, on any engine.
+    """
+    stats = QueryStats(route=route)
+    token = query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """
+    Fail with AssertionError when the block executes more than `limit`
+    statements, listing them, so a query-count regression fails the check:
+
+        with assert_max_queries(3):
+            await events_service.create_registration(...)
+    """
+    with track_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        executed = "\n".join(f"  {n} x {sql}" for sql, n in stats.statements.items())
+        raise AssertionError(
+            f"Expected at most {limit} statements, {stats.count} were executed:\n{executed}"
+        )
+
+
+def _operation(statement: str) -> str:
+    keyword = statement.lstrip()[:6].upper()
+    return keyword.lower() if keyword in OPERATIONS else "other"
+
+
+def instrument_engine(engine: AsyncEngine, database: str) -> None:
+    """
+    Time every statement the engine executes and expose its pool statistics.
+    """
+    _engines[database] = engine
+
+    def before_cursor_execute(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        context._started_at = time.perf_counter()  # type: ignore[attr-defined]
+
+    def after_cursor_execute(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        elapsed = time.perf_counter() - context._started_at  # type: ignore[attr-defined]
+        db_statement_duration.labels(database, _operation(statement)).observe(elapsed)
+
+        stats = query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+            stats.statements[statement] += 1
+
+        threshold = db_config.DATABASE_SLOW_QUERY_THRESHOLD
+        if threshold and elapsed >= threshold:
+            logger.warning(
+                f"Slow query on {database} ({elapsed * 1000:.1f} ms) "
+                f"during {stats.route if stats and stats.route else 'no request'}: {statement}"
+            )
+
+    def handle_error(context: ExceptionContext) -> None:
+        db_statement_errors.labels(database).inc()
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
+
+
+def _pool_stats() -> Iterator[tuple[str, PoolStats]]:
+    for database, engine in list(_engines.items()):
+        pool = engine.pool
+        if isinstance(pool, InstrumentedQueuePool):
+            yield database, pool.stats()
+
+
+def _pool_connections() -> Iterator[Sample]:
+    for database, stats in _pool_stats():
+        yield (database, "checked_out"), stats.checked_out
+        yield (database, "checked_in"), stats.checked_in
+        yield (database, "overflow"), stats.overflow
+
+
+registry.callback(
+    "db_pool_connections",
+    "Connections of the pool by state.",
+    "gauge",
+    ("database", "state"),
+    _pool_connections,
+)
+registry.callback(
+    "db_pool_checkouts_total",
+    "Connections handed out by the pool.",
+    "counter",
+    ("database",),
+    lambda: (((database,), stats.checkouts) for database, stats in _pool_stats()),
+)
+registry.callback(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up waiting for a connection.",
+    "counter",
+    ("database",),
+    lambda: (((database,), stats.timeouts) for database, stats in _pool_stats()),
+)
+registry.callback(
+    "db_pool_wait_seconds_total",
+    "Time spent getting a connection from the pool.",
+    "counter",
+    ("database",),
+    lambda: (((database,), stats.wait_seconds_total) for database, stats in _pool_stats()),
+)
@@ -0,0 +1,42 @@
+import itertools
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+class ReplicaSessionFactory:
+    """
+    Stands in for an async_sessionmaker in read-only units of work: every call
+    returns a session on the next replica in turn. For `window` seconds after
+    a commit in this process, sessions are opened on the primary instead, so
+    a client reads its own writes while the replicas catch up.
+
+    The window is tracked per process: with several workers behind a load
+    balancer it should cover the usual replication lag.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replicas: list[async_sessionmaker[AsyncSession]],
+        window: float,
+    ) -> None:
+        self._primary = primary
+        self._replicas = itertools.cycle(replicas) if replicas else None
+        self.window = window
+        self._last_write = float("-inf")
+
+    def record_write(self) -> None:
+        self._last_write = time.monotonic()
+
+    def reads_from_primary(self) -> bool:
+        return (
+            self._replicas is None
+            or time.monotonic() - self._last_write < self.window
+        )
+
+    def __call__(self) -> AsyncSession:
+        if self.reads_from_primary():
+            return self._primary()
+        assert self._replicas is not None
+        return next(self._replicas)()
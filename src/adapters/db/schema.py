@@ -0,0 +1,208 @@
+"""
+Versioned database schema.
+
+The database records the number of the last migration applied to it in the
+one-row `schema_version` table. At startup a single SELECT compares it with
+SCHEMA_VERSION, and nothing else happens when the schema is current. When it
+is behind, the pending migrations run in one transaction; on PostgreSQL an
+advisory lock lets only one of the starting workers apply them while the
+others wait and then find the schema current.
+
+Migrations are appended to MIGRATIONS and never reordered. They also run on
+fresh databases, right after the first one has created every table from the
+current models, so they must tolerate objects that already exist.
+"""
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    Integer,
+    MetaData,
+    Table,
+    exc,
+    inspect,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.adapters.orm import SqlAlchemyBase, utc_now
+
+logger = logging.getLogger("uvicorn")
+
+Migration = Callable[[Connection], None]
+
+# Arbitrary key of the PostgreSQL advisory lock held while migrating.
+SCHEMA_LOCK_KEY = 0x6D656574
+
+metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("version", Integer, nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+
+def _create_tables(connection: Connection) -> None:
+    """Create every table of the application models."""
+    # create_all skips tables that exist, so it never adds columns or
+    # constraints to them; such changes need a migration of their own.
+    # Workers that boot without the API still create the complete schema.
+    import src.events.orm  # noqa: F401
+    import src.outbox.orm  # noqa: F401
+    import src.users.orm  # noqa: F401
+
+    SqlAlchemyBase.metadata.create_all(connection)
+
+
+def _create_event_search_index(connection: Connection) -> None:
+    """Add the full-text index of events."""
+    from src.events.search import create_search_index
+
+    create_search_index(connection)
+
+
+def _create_event_stats(connection: Connection) -> None:
+    """Add the hourly registration rollup of events."""
+    from src.events.orm import EventStatsHourly
+
+    EventStatsHourly.__table__.create(connection, checkfirst=True)
+
+
+# Columns added to tables that databases created before schema versioning
+# already have, as (table, column, DDL type and default).
+_ADDED_COLUMNS = (
+    ("users", "token_version", "INTEGER DEFAULT 0 NOT NULL"),
+    ("events", "capacity", "INTEGER"),
+    ("events", "registrations_count", "INTEGER DEFAULT 0 NOT NULL"),
+)
+
+
+def _upgrade_unversioned_tables(connection: Connection) -> None:
+    """Bring tables created before schema versioning up to the models."""
+    from src.events.orm import Event
+
+    inspector = inspect(connection)
+    added: set[str] = set()
+    for table, column, ddl in _ADDED_COLUMNS:
+        if column not in {c["name"] for c in inspector.get_columns(table)}:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+            added.add(column)
+
+    # ON CONFLICT (event_id, user_id) needs a unique index on those columns,
+    # which cannot be built while a user is registered twice for an event.
+    covered = [
+        *(c["column_names"] for c in inspector.get_unique_constraints("event_registrations")),
+        *(i["column_names"] for i in inspector.get_indexes("event_registrations") if i["unique"]),
+    ]
+    if not any(set(columns) == {"event_id", "user_id"} for columns in covered):
+        connection.execute(text(
+            "DELETE FROM event_registrations WHERE id NOT IN "
+            "(SELECT MIN(id) FROM event_registrations GROUP BY event_id, user_id)"
+        ))
+        connection.execute(text(
+            "CREATE UNIQUE INDEX uq_event_registrations_event_id_user_id "
+            "ON event_registrations (event_id, user_id)"
+        ))
+
+    if "registrations_count" in added:
+        connection.execute(text(
+            "UPDATE events SET registrations_count = (SELECT COUNT(*) FROM event_registrations "
+            "WHERE event_registrations.event_id = events.event_id)"
+        ))
+
+    for index in Event.__table__.indexes:
+        index.create(connection, checkfirst=True)
+
+
+def _create_user_email_index(connection: Connection) -> None:
+    """Add the case-insensitive index of user emails."""
+    # SQLite does not reflect expression indexes, so checkfirst cannot tell
+    # whether create_all already built it.
+    connection.execute(
+        text("CREATE INDEX IF NOT EXISTS ix_users_email_lower ON users (lower(email))")
+    )
+
+
+MIGRATIONS: list[Migration] = [
+    _create_tables,
+    _create_event_search_index,
+    _create_event_stats,
+    _upgrade_unversioned_tables,
+    _create_user_email_index,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+@dataclass(frozen=True)
+class SchemaCheck:
+    found_version: int
+    version: int
+
+    @property
+    def migrated(self) -> bool:
+        return self.found_version != self.version
+
+
+async def _read_version(connection: AsyncConnection) -> int:
+    version = await connection.scalar(
+        select(schema_version.c.version).where(schema_version.c.id == 1)
+    )
+    return version or 0
+
+
+async def current_version(engine: AsyncEngine) -> int:
+    """
+    Version recorded in the database, 0 if it has never been migrated.
+    """
+    try:
+        async with engine.connect() as connection:
+            return await _read_version(connection)
+    except exc.DBAPIError:
+        # No schema_version table yet.
+        return 0
+
+
+async def ensure_schema(engine: AsyncEngine) -> SchemaCheck:
+    """
+    Bring the database schema up to SCHEMA_VERSION. A database that is ahead,
+    as seen by old workers during a rolling deploy, is left alone.
+    """
+    found = await current_version(engine)
+    if found >= SCHEMA_VERSION:
+        return SchemaCheck(found_version=found, version=found)
+
+    async with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            await connection.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY}
+            )
+        await connection.run_sync(metadata.create_all)
+        # Another worker may have migrated while this one waited for the lock.
+        version = await _read_version(connection)
+        for number in range(version + 1, SCHEMA_VERSION + 1):
+            migration = MIGRATIONS[number - 1]
+            logger.info(f"Applying schema migration {number}: {migration.__doc__}")
+            await connection.run_sync(migration)
+
+        if version < SCHEMA_VERSION:
+            await _write_version(connection, SCHEMA_VERSION)
+    return SchemaCheck(found_version=found, version=max(version, SCHEMA_VERSION))
+
+
+async def _write_version(connection: AsyncConnection, version: int) -> None:
+    values = {"version": version, "applied_at": utc_now()}
+    result = await connection.execute(
+        update(schema_version).where(schema_version.c.id == 1).values(**values)
+    )
+    if result.rowcount == 0:
+        await connection.execute(schema_version.insert().values(id=1, **values))
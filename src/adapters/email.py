@@ -1,59 +1,226 @@
-import logging
-from aiosmtplib.errors import SMTPDataError
-from fastapi_mail import FastMail, MessageSchema, MessageType
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import date
+from email.message import EmailMessage as MIMEMessage
+from email.utils import formataddr, formatdate, make_msgid
+from functools import cache
+
+import aiosmtplib
+from aiosmtplib.errors import (
+    SMTPException,
+    SMTPRecipientsRefused,
+    SMTPResponseException,
+    SMTPServerDisconnected,
+)
+from fastapi_mail import ConnectionConfig
 from fastapi_mail.errors import ConnectionErrors
-from pydantic import EmailStr
+from jinja2 import Environment, Template
+from pydantic import BaseModel, EmailStr
 
+from src.config.base_config import settings
 from src.config.email_config import mail_conf
 
-logger = logging.getLogger("uvicorn")
 
-async def send_message_with_template(
-    subject: str,
-    recipients: list[str],
-    template_body: dict[str, str],
-    template_name: str,
-) -> None:
+class EmailMessage(BaseModel):
+    subject: str
+    recipients: list[str]
+    template_name: str
+    template_body: dict[str, str]
+
+
+class SMTPConnectionPool:
     """
-    The send_message_with_template function sends an email message to the specified recipients.
-    It takes in a subject, a list of recipients, and a template body, then creates an instance
-    of the MessageSchema class with these parameters.
+    Keeps up to `size` connected and authenticated SMTP clients and hands them
+    out one sender at a time, so consecutive messages skip the TCP, TLS and
+    AUTH handshakes. Connections idle for longer than `max_idle` seconds are
+    replaced, since servers drop them on their own after a while.
     """
-    message = MessageSchema(
-        subject=subject,
-        recipients=recipients,
-        template_body=template_body,
-        subtype=MessageType.html,
+
+    def __init__(self, config: ConnectionConfig, size: int, max_idle: float) -> None:
+        self.config = config
+        self.size = size
+        self.max_idle = max_idle
+        self.connections_opened = 0
+        self._idle: list[tuple[float, aiosmtplib.SMTP]] = []
+        self._semaphore: asyncio.Semaphore | None = None
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """
+        Borrow a connection. If the server refuses a message, the connection is
+        reset and returned; on any other error it is closed instead, as it may
+        be in an unknown state.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.size)
+
+        async with self._semaphore:
+            smtp = await self._take()
+            try:
+                yield smtp
+            except (SMTPResponseException, SMTPRecipientsRefused):
+                await self._reset(smtp)
+                raise
+            except BaseException:
+                self._discard(smtp)
+                raise
+            self._idle.append((time.monotonic(), smtp))
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for _, smtp in idle:
+            try:
+                await smtp.quit()
+            except aiosmtplib.SMTPException:
+                smtp.close()
+
+    async def _take(self) -> aiosmtplib.SMTP:
+        while self._idle:
+            idle_since, smtp = self._idle.pop()
+            if smtp.is_connected and time.monotonic() - idle_since < self.max_idle:
+                return smtp
+            self._discard(smtp)
+        return await self._connect()
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.config.MAIL_SERVER,
+            port=self.config.MAIL_PORT,
+            timeout=self.config.TIMEOUT,
+            use_tls=self.config.MAIL_SSL_TLS,
+            start_tls=self.config.MAIL_STARTTLS,
+            validate_certs=self.config.VALIDATE_CERTS,
+        )
+        try:
+            await smtp.connect()
+            if self.config.USE_CREDENTIALS:
+                await smtp.login(
+                    self.config.MAIL_USERNAME,
+                    self.config.MAIL_PASSWORD.get_secret_value(),
+                )
+        except Exception as error:
+            self._discard(smtp)
+            raise ConnectionErrors(
+                f"Exception raised {error}, check your credentials or email service configuration"
+            ) from error
+        self.connections_opened += 1
+        return smtp
+
+    async def _reset(self, smtp: aiosmtplib.SMTP) -> None:
+        """
+        Abort the refused message's transaction with RSET and put the
+        connection back, or close it if the server does not answer.
+        """
+        try:
+            await smtp.rset()
+        except (SMTPException, OSError):
+            self._discard(smtp)
+            return
+        except BaseException:
+            self._discard(smtp)
+            raise
+        self._idle.append((time.monotonic(), smtp))
+
+    @staticmethod
+    def _discard(smtp: aiosmtplib.SMTP) -> None:
+        if smtp.is_connected:
+            smtp.close()
+
+
+smtp_pool = SMTPConnectionPool(
+    mail_conf, size=settings.mail_pool_size, max_idle=settings.mail_pool_max_idle
+)
+
+
+@cache
+def _template_environment() -> Environment:
+    return mail_conf.template_engine()
+
+
+@cache
+def get_template(template_name: str) -> Template:
+    """
+    Load and compile a template once per process.
+    """
+    return _template_environment().get_template(template_name)
+
+
+def build_message(message: EmailMessage) -> MIMEMessage:
+    mime = MIMEMessage()
+    mime["Subject"] = message.subject
+    mime["From"] = (
+        formataddr((mail_conf.MAIL_FROM_NAME, mail_conf.MAIL_FROM))
+        if mail_conf.MAIL_FROM_NAME
+        else mail_conf.MAIL_FROM
+    )
+    mime["To"] = ", ".join(message.recipients)
+    mime["Date"] = formatdate(localtime=True)
+    mime["Message-ID"] = make_msgid()
+    mime.set_content(
+        get_template(message.template_name).render(**message.template_body),
+        subtype="html",
     )
+    return mime
+
+
+async def deliver_email(message: EmailMessage) -> None:
+    """
+    Render the message template and send it over a pooled connection. SMTP and
+    connection errors are raised, so the caller can retry.
+    """
+    mime = build_message(message)
+    if mail_conf.SUPPRESS_SEND:
+        return
 
-    fm = FastMail(mail_conf)
     try:
-        await fm.send_message(message, template_name=template_name)
+        async with smtp_pool.connection() as smtp:
+            await smtp.send_message(mime)
+    except SMTPServerDisconnected:
+        # The server closed an idle connection; retry once on a fresh one.
+        async with smtp_pool.connection() as smtp:
+            await smtp.send_message(mime)
 
-    except SMTPDataError as e:
-        logger.error("SMTPDataError: %s", e.message)
 
-    except ConnectionErrors as e:
-        logger.error("ConnectionError: %s", str(e))
+async def send_many(
+    messages: list[EmailMessage], concurrency: int | None = None
+) -> list[Exception | None]:
+    """
+    Send several messages, at most `concurrency` at a time (the pool size by
+    default), back to back over the pooled connections. Returns the error of
+    each message, or None for the ones that were sent, in input order.
+    """
+    semaphore = asyncio.Semaphore(concurrency or smtp_pool.size)
 
+    async def send(message: EmailMessage) -> Exception | None:
+        async with semaphore:
+            try:
+                await deliver_email(message)
+            except Exception as e:
+                return e
+        return None
 
-async def send_event_registration_email(
+    return list(await asyncio.gather(*map(send, messages)))
+
+
+def event_registration_email(
     email: EmailStr,
     event_name: str,
-    event_date: str,
+    event_date: date,
     host: str,
-) -> None:
+) -> EmailMessage:
     """
-    Send Event Registration Email
+    Event Registration Email, to be queued in the outbox.
     """
-    await send_message_with_template(
+    return EmailMessage(
         subject="Event Registration Confirmation",
         recipients=[email],
         template_body={
             "event_name": event_name,
-            "event_date": event_date,
+            "event_date": str(event_date),
             "host": host,
             "email": email,
         },
         template_name="event_registration_template.html",
-    )
\ No newline at end of file
+    )
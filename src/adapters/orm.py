@@ -9,13 +9,18 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
 
+def utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
 class SqlAlchemyBase(DeclarativeBase):
     __abstract__ = True
+    # Callables, so every insert and update gets its own timestamp.
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.now(UTC), index=True
+        DateTime(timezone=True), default=utc_now, index=True
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.now(UTC), onupdate=datetime.now(UTC)
+        DateTime(timezone=True), default=utc_now, onupdate=utc_now
     )
 
 
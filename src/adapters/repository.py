@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from functools import cache
 from typing import Any, Generic
 
 from pydantic import BaseModel
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import Result, RowMapping, Select, delete, func, insert, inspect, select, update
+from sqlalchemy.engine import ScalarResult
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 from typing_extensions import TypeVar
 
 from src.adapters.orm import SqlAlchemyBase
@@ -31,6 +35,11 @@ class IRepository(ABC):
         self, data: BaseModel | dict[str, Any], schema_override: Any | None = None
     ) -> Any: ...
 
+    @abstractmethod
+    async def add_many(
+        self, data: list[BaseModel | dict[str, Any]], chunk_size: int = 1000
+    ) -> list[Any]: ...
+
     @abstractmethod
     async def get_one(
         self,
@@ -62,9 +71,43 @@ class AsyncRepository(Generic[ModelType, SchemaType]):
     model: type[ModelType]
     schema: type[SchemaType]
 
+    # Select only the columns the schema declares and validate the rows as
+    # they come, instead of building ORM instances first. Turn it off in a
+    # repository whose schema needs attributes that are not table columns.
+    projection: bool = True
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    @classmethod
+    @cache
+    def columns(cls) -> tuple[InstrumentedAttribute, ...]:
+        """
+        Mapped columns of the model that are fields of the schema.
+        """
+        fields = cls.schema.model_fields
+        return tuple(
+            getattr(cls.model, attr.key)
+            for attr in inspect(cls.model).column_attrs
+            if attr.key in fields
+        )
+
+    def _select(self) -> Select:
+        return select(*self.columns()) if self.projection else select(self.model)
+
+    def _returning(self) -> tuple[Any, ...]:
+        return self.columns() if self.projection else (self.model,)
+
+    def _rows(self, result: Result) -> Result | ScalarResult:
+        """
+        Rows of a statement built with _select or _returning: column tuples
+        in projection mode, ORM instances otherwise.
+        """
+        return result if self.projection else result.scalars()
+
+    def _to_schema(self, item: Any) -> SchemaType:
+        return self.schema.model_validate(item._asdict() if self.projection else item.__dict__)
+
     async def get_all(
         self,
         **filter_by: Any,
@@ -72,10 +115,30 @@ class AsyncRepository(Generic[ModelType, SchemaType]):
         """
         Fetch all entities and validate them against the specified schema.
         """
-        stmt = select(self.model).filter_by(**filter_by)
+        stmt = self._select().filter_by(**filter_by)
         result = await self.session.execute(stmt)
-        entities = result.scalars().all()
-        return [self.schema.model_validate(entity.__dict__) for entity in entities]
+        return [self._to_schema(item) for item in self._rows(result)]
+
+    async def stream(
+        self, batch_size: int = 1000, **filter_by: Any
+    ) -> AsyncIterator[RowMapping]:
+        """
+        Yield the schema's columns of the matching rows in primary key order,
+        read through a server-side cursor `batch_size` rows at a time. Rows are
+        not validated, so they can be encoded as soon as they arrive.
+        """
+        stmt = (
+            select(*self.columns())
+            .filter_by(**filter_by)
+            .order_by(*inspect(self.model).primary_key)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        # One partition per fetch: iterating row by row would switch into
+        # the driver's greenlet for every row.
+        async for rows in result.mappings().partitions():
+            for row in rows:
+                yield row
 
     async def add_one(
         self,
@@ -86,10 +149,39 @@ class AsyncRepository(Generic[ModelType, SchemaType]):
         """
         data = data if isinstance(data, dict) else data.model_dump()
 
-        stmt = insert(self.model).values(**data).returning(self.model)
+        stmt = insert(self.model).values(**data).returning(*self._returning())
         result = await self.session.execute(stmt)
-        entity = result.scalar_one()
-        return self.schema.model_validate(entity.__dict__)
+        return self._to_schema(self._rows(result).one())
+
+    async def add_many(
+        self,
+        data: list[BaseModel | dict[str, Any]],
+        chunk_size: int = 1000,
+    ) -> list[SchemaType]:
+        """
+        Add many entities with multi-row INSERT ... RETURNING statements of
+        `chunk_size` rows each. Runs in the caller's transaction, so either
+        every chunk is committed or none is.
+
+        A multi-row RETURNING does not promise rows in VALUES order, so each
+        chunk is sorted by primary key; for auto-increment keys, which are
+        assigned in VALUES order, that returns the rows in the order of `data`.
+        """
+        rows = [item if isinstance(item, dict) else item.model_dump() for item in data]
+        keys = [column.key for column in inspect(self.model).primary_key]
+
+        created: list[SchemaType] = []
+        for start in range(0, len(rows), chunk_size):
+            stmt = (
+                insert(self.model)
+                .values(rows[start : start + chunk_size])
+                .returning(*self._returning())
+            )
+            result = await self.session.execute(stmt)
+            chunk = [self._to_schema(item) for item in self._rows(result)]
+            chunk.sort(key=lambda item: tuple(getattr(item, key) for key in keys))
+            created.extend(chunk)
+        return created
 
     async def update_one(
         self,
@@ -105,21 +197,35 @@ class AsyncRepository(Generic[ModelType, SchemaType]):
             update(self.model)
             .values(**data)
             .filter_by(**filter_by)
-            .returning(self.model)
+            .returning(*self._returning())
         )
         result = await self.session.execute(stmt)
-        entity = result.scalar_one()
-        return self.schema.model_validate(entity.__dict__)
+        return self._to_schema(self._rows(result).one())
 
     async def delete_one(
         self,
         **filter_by: Any,
     ) -> None:
-        stmt = delete(self.model).filter_by(**filter_by).returning(self.model)
+        stmt = delete(self.model).filter_by(**filter_by)
         await self.session.execute(stmt)
 
     async def get_one(self, **filter_by: Any) -> SchemaType | None:
-        query = select(self.model).filter_by(**filter_by)
+        query = self._select().filter_by(**filter_by)
         result = await self.session.execute(query)
-        entity = result.scalar_one_or_none()
-        return self.schema.model_validate(entity.__dict__) if entity else None
+        item = self._rows(result).one_or_none()
+        return self._to_schema(item) if item is not None else None
+
+    async def get_version(self, **filter_by: Any) -> tuple[Any, ...]:
+        """
+        Cheap fingerprint of the matching rows: their count, the highest primary
+        key and the latest update time. It changes whenever a matching row is
+        added, removed or updated, without loading the rows themselves.
+        """
+        primary_key = inspect(self.model).primary_key[0]
+        stmt = select(
+            func.count(primary_key),
+            func.max(primary_key),
+            func.max(self.model.updated_at),
+        ).filter_by(**filter_by)
+        result = await self.session.execute(stmt)
+        return tuple(result.one())
@@ -0,0 +1,154 @@
+"""
+Local SMTP stand-in for development, tests and benchmarks.
+
+Accepts every message, with or without AUTH, and keeps it in memory instead of
+delivering it. It speaks plain SMTP only, so point the app at it with:
+
+    MAIL_SERVER=127.0.0.1 MAIL_PORT=1025 MAIL_SSL_TLS=false MAIL_STARTTLS=false
+
+    python -m src.adapters.smtp_stub --port 1025
+"""
+import argparse
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+logger = logging.getLogger("uvicorn")
+
+
+@dataclass(frozen=True)
+class ReceivedMessage:
+    sender: str
+    recipients: list[str]
+    data: bytes
+
+
+class LocalSMTPServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 1025, fail: bool = False) -> None:
+        self.host = host
+        self.port = port
+        # When set, every message is rejected with a transient error, to exercise retries.
+        self.fail = fail
+        self.messages: list[ReceivedMessage] = []
+        self.connections = 0
+        self._server: asyncio.Server | None = None
+        self._clients: set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # Port 0 asks the OS for a free port; report the one actually bound.
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        assert self._server is not None
+        self._server.close()
+        # Clients may keep connections open between messages; hang up on them.
+        for writer in self._clients:
+            writer.close()
+        await self._server.wait_closed()
+
+    async def __aenter__(self) -> "LocalSMTPServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._clients.add(writer)
+
+        async def reply(line: str) -> None:
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        sender, recipients = "", []
+        await reply("220 localhost SMTP stand-in ready")
+        try:
+            while line := await reader.readline():
+                command = line.decode(errors="replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+                if verb == "EHLO":
+                    await reply("250-localhost")
+                    await reply("250-AUTH PLAIN LOGIN")
+                    await reply("250 8BITMIME")
+                elif verb == "HELO":
+                    await reply("250 localhost")
+                elif verb == "AUTH":
+                    await self._authenticate(command, reader, reply)
+                elif verb == "MAIL":
+                    sender, recipients = self._address(command), []
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    recipients.append(self._address(command))
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    data = await self._read_data(reader)
+                    if self.fail:
+                        await reply("451 Requested action aborted: try again later")
+                    else:
+                        self.messages.append(ReceivedMessage(sender, recipients, data))
+                        logger.info("SMTP stand-in received a message for %s", ", ".join(recipients))
+                        await reply("250 OK: queued")
+                elif verb in ("RSET", "NOOP"):
+                    sender, recipients = "", []
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    @staticmethod
+    async def _authenticate(
+        command: str,
+        reader: asyncio.StreamReader,
+        reply: Callable[[str], Awaitable[None]],
+    ) -> None:
+        parts = command.split()
+        mechanism = parts[1].upper() if len(parts) > 1 else ""
+        if mechanism == "LOGIN":
+            # Username and password prompts, both base64 encoded.
+            for prompt in ("334 VXNlcm5hbWU6", "334 UGFzc3dvcmQ6"):
+                await reply(prompt)
+                await reader.readline()
+        elif mechanism == "PLAIN" and len(parts) == 2:
+            await reply("334 ")
+            await reader.readline()
+        await reply("235 Authentication successful")
+
+    @staticmethod
+    def _address(command: str) -> str:
+        _, _, value = command.partition(":")
+        return value.strip().split(" ", 1)[0].strip("<>")
+
+    @staticmethod
+    async def _read_data(reader: asyncio.StreamReader) -> bytes:
+        lines = []
+        while (line := await reader.readline()) not in (b".\r\n", b".\n", b""):
+            # Undo dot-stuffing of lines that start with a dot.
+            lines.append(line[1:] if line.startswith(b"..") else line)
+        return b"".join(lines)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    async with LocalSMTPServer(args.host, args.port) as server:
+        logger.info("SMTP stand-in listening on %s:%s", server.host, server.port)
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,8 +1,12 @@
 from typing import Any, Protocol, Self
+import time
 import traceback as tb
 from types import TracebackType
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.adapters.db.replica import ReplicaSessionFactory
+from src.common.metrics import uow_session_duration, uow_sessions_open
 
 import logging
 
@@ -23,9 +27,30 @@ class AsyncBaseUnitOfWork(Protocol):
 
 
 class AsyncSqlAlchemyUnitOfWork(AsyncBaseUnitOfWork):
-    def __init__(self, session_factory: async_scoped_session[AsyncSession]) -> None:
+    """
+    Opens a fresh session on every `async with` and closes it on exit.
+    An instance is meant to serve a single request (see the Factory providers
+    in src/container.py); it must not be entered concurrently.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        read_session_factory: ReplicaSessionFactory | None = None,
+    ) -> None:
         self._session_factory = session_factory
+        self._read_session_factory = read_session_factory
+        self._read_only = False
         self._session: AsyncSession | None = None
+        self._opened_at = 0.0
+
+    def read_only(self) -> Self:
+        """
+        Open the next session on a read replica, if any are configured:
+        `async with uow.read_only(): ...`. Such a unit of work must not commit.
+        """
+        self._read_only = True
+        return self
 
     @property
     def session(self) -> AsyncSession:
@@ -36,7 +61,12 @@ class AsyncSqlAlchemyUnitOfWork(AsyncBaseUnitOfWork):
         """
         Entering the SqlAlchemyUnitOfWork.
         """
-        self._session = self._session_factory()
+        if self._read_only and self._read_session_factory is not None:
+            self._session = self._read_session_factory()
+        else:
+            self._session = self._session_factory()
+        self._opened_at = time.perf_counter()
+        uow_sessions_open.labels(self._mode).inc()
         logger.info(f"Open session UOW: {self.session.__str__()}")
         return self
 
@@ -57,10 +87,25 @@ class AsyncSqlAlchemyUnitOfWork(AsyncBaseUnitOfWork):
             await self.rollback()
         logger.info(f"Close session UOW: {self.session.__str__()}")
 
-        await self.session.close()
+        try:
+            await self.session.close()
+        finally:
+            uow_sessions_open.labels(self._mode).dec()
+            uow_session_duration.labels(self._mode).observe(
+                time.perf_counter() - self._opened_at
+            )
+            self._session = None
+            self._read_only = False
+
+    @property
+    def _mode(self) -> str:
+        return "read" if self._read_only else "write"
 
     async def commit(self) -> None:
+        assert not self._read_only, "read-only unit of work cannot commit"
         await self.session.commit()
+        if self._read_session_factory is not None:
+            self._read_session_factory.record_write()
 
     async def rollback(self) -> None:
         self.session.expunge_all()
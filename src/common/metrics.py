@@ -0,0 +1,326 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Metrics are only updated from the event loop thread (code that runs in a
+worker thread reports its timing back to the awaiting coroutine), so the
+values are plain attributes without locks. Like the caches, they are per
+worker process; Prometheus sums them across the scraped workers.
+"""
+import math
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+from functools import lru_cache
+from typing import Generic, TypeVar
+
+from starlette.applications import Starlette
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request latency, in seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Single database statements, in seconds.
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+Sample = tuple[tuple[str, ...], float]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}" if pairs else ""
+
+
+class CounterValue:
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class GaugeValue(CounterValue):
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class HistogramValue:
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        # Per-bucket counts; the last one counts observations above every bound.
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+V = TypeVar("V", CounterValue, GaugeValue, HistogramValue)
+
+
+class Metric(ABC, Generic[V]):
+    kind: str
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], V] = {}
+
+    def labels(self, *values: str) -> V:
+        value = self._values.get(values)
+        if value is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            value = self._values[values] = self._new_value()
+        return value
+
+    @abstractmethod
+    def _new_value(self) -> V: ...
+
+    def collect(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for labelvalues, value in list(self._values.items()):
+            yield from self._samples(labelvalues, value)
+
+    def _samples(self, labelvalues: tuple[str, ...], value: V) -> Iterator[str]:
+        labels = _format_labels(self.labelnames, labelvalues)
+        yield f"{self.name}{labels} {_format_value(value.value)}"  # type: ignore[union-attr]
+
+
+class Counter(Metric[CounterValue]):
+    kind = "counter"
+
+    def _new_value(self) -> CounterValue:
+        return CounterValue()
+
+
+class Gauge(Metric[GaugeValue]):
+    kind = "gauge"
+
+    def _new_value(self) -> GaugeValue:
+        return GaugeValue()
+
+
+class Histogram(Metric[HistogramValue]):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_value(self) -> HistogramValue:
+        return HistogramValue(self.buckets)
+
+    def _samples(self, labelvalues: tuple[str, ...], value: HistogramValue) -> Iterator[str]:
+        names = (*self.labelnames, "le")
+        cumulative = 0
+        for bound, count in zip((*self.buckets, math.inf), value.counts):
+            cumulative += count
+            labels = _format_labels(names, (*labelvalues, _format_value(bound)))
+            yield f"{self.name}_bucket{labels} {cumulative}"
+        labels = _format_labels(self.labelnames, labelvalues)
+        yield f"{self.name}_sum{labels} {_format_value(value.sum)}"
+        yield f"{self.name}_count{labels} {cumulative}"
+
+
+class CallbackMetric:
+    """
+    Metric whose samples are read from their source at scrape time, for
+    values other components already keep, like pool and cache statistics.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        labelnames: tuple[str, ...],
+        callback: Callable[[], Iterable[Sample]],
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = labelnames
+        self.callback = callback
+
+    def collect(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for labelvalues, value in self.callback():
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric | CallbackMetric] = {}
+
+    def register(self, metric: Metric | CallbackMetric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        metric = Gauge(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.register(metric)
+        return metric
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        labelnames: tuple[str, ...],
+        callback: Callable[[], Iterable[Sample]],
+    ) -> CallbackMetric:
+        metric = CallbackMetric(name, documentation, kind, labelnames, callback)
+        self.register(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.collect())
+        lines.append("")
+        return "\n".join(lines)
+
+
+registry = Registry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to handle an HTTP request, by route template.",
+    ("method", "route"),
+)
+http_responses = registry.counter(
+    "http_responses_total",
+    "HTTP responses sent, by route template and status code.",
+    ("method", "route", "status"),
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight",
+    "HTTP requests being handled right now.",
+    ("method", "route"),
+)
+db_statement_duration = registry.histogram(
+    "db_statement_duration_seconds",
+    "Time to execute a database statement, by database and statement type.",
+    ("database", "operation"),
+    buckets=DB_BUCKETS,
+)
+db_statement_errors = registry.counter(
+    "db_statement_errors_total",
+    "Database statements that raised, by database.",
+    ("database",),
+)
+uow_session_duration = registry.histogram(
+    "uow_session_duration_seconds",
+    "How long a unit of work keeps its session open.",
+    ("mode",),
+)
+uow_sessions_open = registry.gauge(
+    "uow_sessions_open",
+    "Units of work with an open session.",
+    ("mode",),
+)
+password_hash_duration = registry.histogram(
+    "password_hash_duration_seconds",
+    "Time spent in bcrypt, by operation, excluding the wait for a free worker.",
+    ("operation",),
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency, in-flight requests and response
+    codes per route template, so /events/1 and /events/2 share one series.
+    The route is resolved up front to label the in-flight gauge; requests
+    that match no route are counted under "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp, route_cache_size: int = 10_000) -> None:
+        self.app = app
+        # Matching walks every route; repeated paths are answered from here.
+        self._route = lru_cache(maxsize=route_cache_size)(self._match_route)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route(scope["app"], method, scope["root_path"], scope["path"])
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = http_requests_in_flight.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_request_duration.labels(method, route).observe(time.perf_counter() - started)
+            http_responses.labels(method, route, str(status_code)).inc()
+            in_flight.dec()
+
+    @staticmethod
+    def _match_route(app: Starlette, method: str, root_path: str, path: str) -> str:
+        scope = {"type": "http", "method": method, "root_path": root_path, "path": path}
+        for route in app.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return UNMATCHED_ROUTE
@@ -0,0 +1,29 @@
+import base64
+import binascii
+
+CURSOR_SEPARATOR = "|"
+
+
+def encode_cursor(*values: str) -> str:
+    """
+    Pack the sort key of the last row on a page into an opaque, URL-safe cursor.
+    """
+    raw = CURSOR_SEPARATOR.join(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[str]:
+    """
+    Unpack a cursor produced by encode_cursor. Raises ValueError if the cursor
+    is malformed or does not hold exactly `size` values.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError("Malformed cursor.") from e
+
+    values = raw.split(CURSOR_SEPARATOR)
+    if len(values) != size:
+        raise ValueError("Malformed cursor.")
+    return values
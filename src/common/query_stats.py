@@ -0,0 +1,48 @@
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.adapters.db.instrumentation import track_queries
+
+logger = logging.getLogger("uvicorn")
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+
+
+class QueryStatsMiddleware:
+    """
+    Tracks the statements each request executes. Requests that run one
+    statement `n_plus_one_threshold` times or more are logged as a likely
+    N+1 query. With `headers` on (debug mode) the count and total database
+    time are returned in response headers; statements run while a streaming
+    response is being sent are not included.
+    """
+
+    def __init__(self, app: ASGIApp, headers: bool = False, n_plus_one_threshold: int = 0) -> None:
+        self.app = app
+        self.headers = headers
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(f"{scope['method']} {scope['path']}") as stats:
+
+            async def send_wrapper(message: Message) -> None:
+                if self.headers and message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append(QUERY_COUNT_HEADER, str(stats.count))
+                    headers.append(QUERY_TIME_HEADER, f"{stats.seconds * 1000:.1f}")
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        if self.n_plus_one_threshold:
+            for statement, count in stats.repeated(self.n_plus_one_threshold):
+                logger.warning(
+                    f"Possible N+1 query in {stats.route}: executed {count} times: {statement}"
+                )
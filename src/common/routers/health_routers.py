@@ -0,0 +1,32 @@
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, status
+
+from src.adapters.db.db_manager import AsyncDatabaseSQLAlchemyManager
+from src.common.schemas import PoolStatsResponse
+from src.container import Container
+
+health_router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@health_router.get(
+    "/db-pool",
+    response_model=PoolStatsResponse | None,
+    responses={
+        status.HTTP_200_OK: {
+            "model": PoolStatsResponse,
+            "description": "Connection pool statistics of this worker process, "
+            "or null if the pool does not collect them.",
+        },
+    },
+)
+@inject
+async def db_pool_stats(
+    db_manager: AsyncDatabaseSQLAlchemyManager = Depends(Provide(Container.db_manager)),
+) -> PoolStatsResponse | None:
+    """
+    ## Database pool statistics
+
+    Counters are per worker process and cumulative since startup.
+    """
+    stats = db_manager.pool_stats()
+    return PoolStatsResponse.model_validate(stats) if stats else None
@@ -0,0 +1,55 @@
+from collections.abc import Iterator
+
+from fastapi import APIRouter, Response
+
+from src.adapters.email import smtp_pool
+from src.common.metrics import CONTENT_TYPE, Sample, registry
+from src.events.cache import event_cache, event_page_cache
+from src.users.cache import principal_cache, token_versions
+from src.users.utils import password_hasher
+
+metrics_router = APIRouter(tags=["Metrics"])
+
+CACHES = {
+    "principal": principal_cache,
+    "token_version": token_versions,
+    "event": event_cache,
+    "event_page": event_page_cache,
+}
+
+
+def _cache_stats(field: str) -> Iterator[Sample]:
+    for name, cache in CACHES.items():
+        yield (name,), getattr(cache.stats(), field)
+
+
+registry.callback(
+    "cache_hits_total", "Cache lookups that found a value.", "counter", ("cache",),
+    lambda: _cache_stats("hits"),
+)
+registry.callback(
+    "cache_misses_total", "Cache lookups that found nothing or an expired value.",
+    "counter", ("cache",), lambda: _cache_stats("misses"),
+)
+registry.callback(
+    "cache_entries", "Entries held by the cache.", "gauge", ("cache",),
+    lambda: _cache_stats("size"),
+)
+registry.callback(
+    "smtp_connections_opened_total", "SMTP connections opened by this process.",
+    "counter", (), lambda: [((), smtp_pool.connections_opened)],
+)
+registry.callback(
+    "password_hash_waiting", "Password hashing calls waiting for a free worker.",
+    "gauge", (), lambda: [((), password_hasher.stats.waiting)],
+)
+
+
+@metrics_router.get("/metrics", response_class=Response)
+async def metrics() -> Response:
+    """
+    ## Metrics
+
+    Prometheus text format. Values are per worker process.
+    """
+    return Response(registry.render(), media_type=CONTENT_TYPE)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ErrorResponse(BaseModel):
@@ -12,3 +12,21 @@ class ErrorResponse(BaseModel):
     @classmethod
     def respond(cls, message: str, exception: str | None = None) -> dict[str, str]:
         return cls(message=message, exception=exception).model_dump()
+
+
+class PoolStatsResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    size: int = Field(examples=[5], description="Connections kept open by the pool.")
+    checked_out: int = Field(examples=[3], description="Connections in use right now.")
+    checked_in: int = Field(examples=[2], description="Idle connections ready for use.")
+    overflow: int = Field(examples=[0], description="Connections opened beyond the pool size.")
+    max_overflow: int = Field(examples=[10], description="Limit of overflow connections.")
+    checkouts: int = Field(examples=[1200], description="Connections handed out since startup.")
+    timeouts: int = Field(examples=[0], description="Checkouts that gave up waiting.")
+    wait_seconds_total: float = Field(
+        examples=[0.42], description="Total time spent getting a connection."
+    )
+    wait_seconds_max: float = Field(
+        examples=[0.05], description="Longest time a single checkout took."
+    )
@@ -1,15 +1,18 @@
 from datetime import UTC, datetime, timedelta
+from typing import Any
 
 from dependency_injector.wiring import Provide, inject
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from pydantic import ValidationError
 
 from src.container import Container
 from src.config.base_config import settings
 from src.users.uow import UsersStorageUnitOfWork
+from src.users.cache import principal_cache, token_versions
 from src.users.exceptions import user_exceptions as user_err
-from src.users.schemas import PrivateUser
+from src.users.schemas import Principal, PrivateUser
 
 
 class SecurityService:
@@ -17,8 +20,25 @@ class SecurityService:
     ALGORITHM = settings.algorithm
     oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+    def token_claims(self, user: PrivateUser) -> dict[str, Any]:
+        """
+        The token_claims function returns the claims of the access token issued
+        to the user. In stateless mode the token also carries the user id, role
+        and token version, so protected routes need no user lookup.
+        """
+        claims: dict[str, Any] = {"sub": user.email}
+        if settings.stateless_auth:
+            claims.update(
+                {
+                    "uid": str(user.user_id),
+                    "role": user.role.value,
+                    "ver": user.token_version,
+                }
+            )
+        return claims
+
     async def create_access_token(
-        self, data: dict[str, str | datetime], expires_delta: float | None = None
+        self, data: dict[str, Any], expires_delta: float | None = None
     ) -> str:
         """
         The create_access_token function creates a new access token.
@@ -37,11 +57,12 @@ class SecurityService:
         self,
         uow: UsersStorageUnitOfWork = Depends(Provide[Container.users_storege_unit_of_work]),
         token: str = Depends(oauth2_scheme),
-    ) -> PrivateUser:
+    ) -> Principal:
         """
         The get_current_user function is a dependency that will be used in the
         protected endpoints. It takes a token as an argument and returns the user
         if it's valid, otherwise raises an HTTPException with status code 401.
+        Principals are cached per token subject, so hot endpoints skip the lookup.
         """
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -59,12 +80,57 @@ class SecurityService:
         except JWTError as e:
             raise credentials_exception from e
 
-        async with uow:
+        if settings.stateless_auth and "uid" in payload:
+            return await self._principal_from_claims(payload, uow, credentials_exception)
+
+        principal = principal_cache.get(email)
+        if principal is not None:
+            return principal
+
+        async with uow.read_only():
             user = await uow.users.get_one(email=email)
             if user is None:
                 raise user_err.UserNotFoundError()
 
-        return user
+        principal = Principal.model_validate(user)
+        principal_cache.set(email, principal)
+        return principal
+
+    async def _principal_from_claims(
+        self,
+        payload: dict[str, Any],
+        uow: UsersStorageUnitOfWork,
+        credentials_exception: HTTPException,
+    ) -> Principal:
+        """
+        Build the principal from verified token claims. The database is only
+        consulted when the token version differs from the one last seen for
+        the user, which is how revoked tokens get rejected.
+        """
+        try:
+            principal = Principal(
+                user_id=payload["uid"], email=payload["sub"], role=payload["role"]
+            )
+            version = int(payload["ver"])
+        except (KeyError, ValueError, ValidationError) as e:
+            raise credentials_exception from e
+
+        known_version = token_versions.get(principal.user_id)
+        if known_version == version:
+            return principal
+        # Versions only grow, so an older token is revoked without asking the database.
+        if known_version is not None and version < known_version:
+            raise credentials_exception
+
+        async with uow.read_only():
+            current_version = await uow.users.get_token_version(principal.user_id)
+        if current_version is None:
+            raise user_err.UserNotFoundError()
+
+        token_versions.set(principal.user_id, current_version)
+        if current_version != version:
+            raise credentials_exception
+        return principal
 
 
 security_service = SecurityService()
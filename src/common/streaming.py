@@ -0,0 +1,107 @@
+import codecs
+import csv
+import io
+from collections.abc import AsyncIterator, Mapping, Sequence
+from datetime import date
+from typing import Any
+
+import orjson
+from fastapi import UploadFile
+
+READ_CHUNK_SIZE = 64 * 1024
+WRITE_CHUNK_SIZE = 64 * 1024
+
+
+async def iter_csv_batches(
+    upload: UploadFile, batch_size: int, encoding: str = "utf-8-sig"
+) -> AsyncIterator[list[list[str]]]:
+    """
+    Read an uploaded CSV file in fixed-size chunks and yield its records in
+    batches of at most `batch_size`, so memory use does not grow with the file.
+    Records are split on line breaks: quoted fields spanning lines are not supported.
+    Raises UnicodeDecodeError if the file is not valid text in `encoding`.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    tail = ""
+    batch: list[list[str]] = []
+
+    while True:
+        chunk = await upload.read(READ_CHUNK_SIZE)
+        text = tail + decoder.decode(chunk, final=not chunk)
+        lines = text.splitlines(keepends=True)
+        # The last line may be cut in the middle; keep it for the next chunk.
+        tail = lines.pop() if chunk and lines and not lines[-1].endswith(("\n", "\r")) else ""
+
+        for record in csv.reader(lines):
+            if not record:
+                continue
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+        if not chunk:
+            break
+
+    if batch:
+        yield batch
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+async def iter_ndjson(rows: AsyncIterator[Mapping[str, Any]]) -> AsyncIterator[bytes]:
+    """
+    Encode rows as newline-delimited JSON, yielding chunks of about
+    WRITE_CHUNK_SIZE bytes rather than one tiny chunk per row.
+    """
+    buffer = bytearray()
+    async for row in rows:
+        buffer += orjson.dumps(dict(row), default=_format_value, option=orjson.OPT_APPEND_NEWLINE)
+        if len(buffer) >= WRITE_CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+async def iter_json_array(rows: AsyncIterator[Mapping[str, Any]]) -> AsyncIterator[bytes]:
+    """
+    Encode rows as one JSON array, yielding chunks of about WRITE_CHUNK_SIZE
+    bytes, so a list response can be sent while its rows are still being read.
+    """
+    buffer = bytearray(b"[")
+    separator = b""
+    async for row in rows:
+        buffer += separator
+        buffer += orjson.dumps(dict(row), default=_format_value)
+        separator = b","
+        if len(buffer) >= WRITE_CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += b"]"
+    yield bytes(buffer)
+
+
+async def iter_csv(
+    columns: Sequence[str], rows: AsyncIterator[Mapping[str, Any]]
+) -> AsyncIterator[str]:
+    """
+    Encode rows as CSV with a header line, yielding chunks of about WRITE_CHUNK_SIZE characters.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for row in rows:
+        writer.writerow(
+            _format_value(row[column]) if row[column] is not None else ""
+            for column in columns
+        )
+        if buffer.tell() >= WRITE_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
@@ -1,16 +1,67 @@
+from enum import StrEnum
+
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class HashExecutor(StrEnum):
+    thread: str = "thread"
+    process: str = "process"
+
+
 class Settings(BaseSettings):
     secret_key: str = "secret key"
     algorithm: str = "HS256"
 
+    # Debug mode: responses report the statements they ran in X-DB-Query-Count
+    # and X-DB-Time-Ms headers.
+    debug: bool = False
+
     mail_username: str = "example@meta.ua"
     mail_password: SecretStr = ""
     mail_from: str = "example@meta.ua"
     mail_port: int = 465
     mail_server: str = "smtp.meta.ua"
+    mail_starttls: bool = False
+    mail_ssl_tls: bool = True
+    mail_use_credentials: bool = True
+    mail_validate_certs: bool = True
+    # Reused SMTP connections per process, and how long one may sit idle.
+    mail_pool_size: int = 4
+    mail_pool_max_idle: float = 60.0
+
+    # Password hashing pool. Workers default to the number of CPUs,
+    # max concurrency defaults to the number of workers.
+    password_hash_executor: HashExecutor = HashExecutor.thread
+    password_hash_workers: int | None = None
+    password_hash_max_concurrency: int | None = None
+
+    # Authenticated principals cached per worker, keyed by token subject.
+    principal_cache_ttl: float = 30.0
+    principal_cache_size: int = 10_000
+
+    # Trust user id, role and token version carried in the access token
+    # instead of loading the user on every authenticated request.
+    stateless_auth: bool = False
+
+    # Read-through cache of public event pages, per worker.
+    event_cache_ttl: float = 10.0
+    event_cache_size: int = 10_000
+    event_page_cache_size: int = 1_000
+
+    # Email outbox delivery worker (python -m src.outbox.worker).
+    outbox_batch_size: int = 100
+    outbox_concurrency: int = 10
+    outbox_max_attempts: int = 8
+    outbox_retry_base: float = 30.0
+    outbox_retry_max: float = 3600.0
+    outbox_lease: float = 300.0
+    outbox_poll_interval: float = 1.0
+
+    # Registration counter reconciliation (python -m src.events.reconcile).
+    reconcile_batch_size: int = 1000
+    # Hourly stats backfill (python -m src.events.backfill_stats).
+    stats_backfill_batch_size: int = 1000
 
     model_config = SettingsConfigDict(extra="ignore", env_file=".env", env_file_encoding="utf-8")
 
@@ -28,6 +28,32 @@ class DatabaseConfig(BaseSettings):
     DATABASE_AUTO_COMMIT: bool = False
     DATABASE_EXPIRE_ON_COMMIT: bool = False
 
+    # Connection pool, per worker process.
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = 1800  # Seconds; -1 keeps connections forever.
+    DATABASE_POOL_PRE_PING: bool = True
+
+    # asyncpg only: prepared statements cached per connection. Set it to 0
+    # behind pgbouncer in transaction pooling mode.
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100
+
+    # Read replicas: comma-separated async SQLAlchemy URLs. Read-only units of
+    # work use them in turn; for DATABASE_READ_YOUR_WRITES_WINDOW seconds after
+    # a commit, reads go to the primary instead.
+    DATABASE_REPLICA_URLS: str = ""
+    DATABASE_READ_YOUR_WRITES_WINDOW: float = 2.0
+
+    # Statements slower than this many seconds are logged with their route; 0 disables.
+    DATABASE_SLOW_QUERY_THRESHOLD: float = 0.5
+    # Requests running one statement this many times are logged as a likely
+    # N+1 query; 0 disables.
+    DATABASE_N_PLUS_ONE_THRESHOLD: int = 10
+
+    # SQLite only: seconds a writer waits for the database lock before failing.
+    DATABASE_SQLITE_BUSY_TIMEOUT: float = 30.0
+
     @property
     def GET_ASYNC_DB_URL(self) -> str:
         if self.DATABASE_DIALECT == Dialect.sqlite:
@@ -43,5 +69,9 @@ class DatabaseConfig(BaseSettings):
             )
         return database_url
 
+    @property
+    def GET_REPLICA_URLS(self) -> list[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
 
 database_config: DatabaseConfig = DatabaseConfig()
@@ -13,23 +13,30 @@ class Container(containers.DeclarativeContainer):
         packages=[
             "src.users.routers",
             "src.events.routers",
+            "src.common.routers",
         ],
         modules=[
             "src.common.security",
         ],
     )
     db_manager = providers.Singleton(
-        AsyncDatabaseSQLAlchemyManager, db_uri=db_config.GET_ASYNC_DB_URL
+        AsyncDatabaseSQLAlchemyManager,
+        db_uri=db_config.GET_ASYNC_DB_URL,
+        replica_uris=db_config.GET_REPLICA_URLS,
     )
 
-    users_storege_unit_of_work = providers.Singleton(
+    # Units of work hold the session of the request that entered them,
+    # so every injection gets its own instance.
+    users_storege_unit_of_work = providers.Factory(
         UsersStorageUnitOfWork,
         session_factory=db_manager.provided.session_factory,
+        read_session_factory=db_manager.provided.read_session_factory,
     )
 
-    events_storege_unit_of_work = providers.Singleton(
+    events_storege_unit_of_work = providers.Factory(
         EventsStorageUnitOfWork,
         session_factory=db_manager.provided.session_factory,
+        read_session_factory=db_manager.provided.read_session_factory,
     )
 
     auth_service = providers.Factory(
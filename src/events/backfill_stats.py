@@ -0,0 +1,61 @@
+"""
+Hourly registration stats backfill.
+
+Rebuilds the registrations of event_stats_hourly from the rows of
+event_registrations, in batches of `stats_backfill_batch_size` events, each
+in its own transaction with the events locked, so it can run next to the
+API. Cancellations are kept as they are: cancelled registrations no longer
+exist and cannot be recounted. For the same reason, hours are recounted from
+the registrations that still exist, so run it once, after the deploy that
+adds the stats, rather than on a schedule:
+
+    python -m src.events.backfill_stats
+"""
+import asyncio
+import logging
+
+from src.adapters.db.db_manager import AsyncDatabaseSQLAlchemyManager
+from src.config.base_config import settings
+from src.config.db_config import database_config as db_config
+from src.events.uow import EventsStorageUnitOfWork
+
+logger = logging.getLogger("uvicorn")
+
+
+async def backfill_stats(
+    uow: EventsStorageUnitOfWork, batch_size: int = settings.stats_backfill_batch_size
+) -> int:
+    """
+    Recount every event's registrations per hour. Returns the number of
+    (event, hour) rows written.
+    """
+    written = 0
+    after = 0
+    while True:
+        async with uow:
+            event_ids = await uow.events.lock_next(after, batch_size)
+            if not event_ids:
+                return written
+            counts = await uow.registrations.count_by_hour(event_ids)
+            await uow.stats.set_registrations(counts)
+            await uow.commit()
+        written += len(counts)
+        after = event_ids[-1]
+        logger.info(f"Backfilled stats up to event {after}, {written} hours written")
+
+
+async def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    db = AsyncDatabaseSQLAlchemyManager(db_config.GET_ASYNC_DB_URL)
+    await db.connect(echo=db_config.DATABASE_ECHO)
+    await db.ensure_schema()
+    db.init_session_factory()
+    try:
+        written = await backfill_stats(EventsStorageUnitOfWork(db.session_factory))
+    finally:
+        await db.disconnect()
+    logger.info(f"Stats backfill finished, {written} hours written")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
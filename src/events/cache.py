@@ -0,0 +1,45 @@
+from collections.abc import Hashable
+
+from src.common.cache import TTLCache
+from src.config.base_config import settings
+from src.events.schemas import EventModel, EventsFilter
+
+# Event details keyed by event id.
+event_cache: TTLCache[int, EventModel] = TTLCache(
+    maxsize=settings.event_cache_size,
+    ttl=settings.event_cache_ttl,
+)
+
+# Event list pages and their next cursor, keyed by the page filters.
+event_page_cache: TTLCache[Hashable, tuple[list[EventModel], str | None]] = TTLCache(
+    maxsize=settings.event_page_cache_size,
+    ttl=settings.event_cache_ttl,
+)
+
+
+def page_key(filters: EventsFilter) -> Hashable:
+    return tuple(filters.model_dump().values())
+
+
+def invalidate_event(event_id: int) -> None:
+    """
+    Drop an event and every cached page, since any page may list it.
+    """
+    event_cache.pop(event_id)
+    event_page_cache.clear()
+
+
+def invalidate_pages() -> None:
+    """
+    Drop every cached page after events were added in bulk.
+    """
+    event_page_cache.clear()
+
+
+def forget_event(event_id: int) -> None:
+    """
+    Drop only the event's details after its registration count changed.
+    Pages keep the old count until they expire, rather than clearing every
+    cached page on each registration.
+    """
+    event_cache.pop(event_id)
@@ -15,6 +15,10 @@ def event_exception_handler(
     @app.exception_handler(event_err.ForbiddenError)
     @app.exception_handler(event_err.EventNotFoundError)
     @app.exception_handler(event_err.RegistrationAlreadyExistsError)
+    @app.exception_handler(event_err.InvalidCursorError)
+    @app.exception_handler(event_err.InvalidImportFileError)
+    @app.exception_handler(event_err.InvalidStatsRangeError)
+    @app.exception_handler(event_err.CapacityBelowRegistrationsError)
     async def custom_exception_handler(request: Request, exc: Exception) -> JSONResponse:
         """
         Header for catching special exceptions
@@ -24,6 +28,10 @@ def event_exception_handler(
             event_err.EventNotFoundError: 404,
             event_err.ForbiddenError: 403,
             event_err.RegistrationAlreadyExistsError: 400,
+            event_err.InvalidCursorError: 400,
+            event_err.InvalidImportFileError: 400,
+            event_err.InvalidStatsRangeError: 400,
+            event_err.CapacityBelowRegistrationsError: 400,
         }
 
         status_code = exception_status_map.get(type(exc), 500)
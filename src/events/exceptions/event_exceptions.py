@@ -16,4 +16,32 @@ class RegistrationAlreadyExistsError(Exception):
     they are already registered for."""
 
     def __init__(self, message: str = "Registration already exists for this event.") -> None:
-        super().__init__(message)
\ No newline at end of file
+        super().__init__(message)
+
+
+class InvalidCursorError(Exception):
+    """Exception raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self, message: str = "Invalid pagination cursor.") -> None:
+        super().__init__(message)
+
+
+class InvalidImportFileError(Exception):
+    """Exception raised when an uploaded import file cannot be read."""
+
+    def __init__(self, message: str = "The import file must be a UTF-8 CSV with an email column.") -> None:
+        super().__init__(message)
+
+
+class CapacityBelowRegistrationsError(Exception):
+    """Exception raised when an event's capacity is set below its number of registrations."""
+
+    def __init__(self, message: str = "Capacity cannot be lower than the number of registrations.") -> None:
+        super().__init__(message)
+
+
+class InvalidStatsRangeError(Exception):
+    """Exception raised when a stats report covers an invalid range of days."""
+
+    def __init__(self, message: str = "Invalid report range.") -> None:
+        super().__init__(message)
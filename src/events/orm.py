@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 from datetime import datetime
-from sqlalchemy import UUID, String, ForeignKey
+from sqlalchemy import UUID, DateTime, Index, String, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.adapters.orm import SqlAlchemyBase
@@ -10,6 +10,12 @@ if TYPE_CHECKING:
 
 class Event(SqlAlchemyBase):
     __tablename__ = "events"
+    __table_args__ = (
+        # Keyset pagination order, and the same order scoped by each listing filter.
+        Index("ix_events_event_date_event_id", "event_date", "event_id"),
+        Index("ix_events_organizer_event_date", "organizer", "event_date", "event_id"),
+        Index("ix_events_location_event_date", "location", "event_date", "event_id"),
+    )
 
     event_id: Mapped[int] = mapped_column(primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255))
@@ -18,6 +24,10 @@ class Event(SqlAlchemyBase):
     location: Mapped[str] = mapped_column(String(255))
     organizer: Mapped[str] = mapped_column(String(100))
     author_id: Mapped[UUID] = mapped_column(ForeignKey("users.user_id"))
+    # None means unlimited. registrations_count is kept in step with the
+    # registrations table and is what seat allocation checks against capacity.
+    capacity: Mapped[int | None] = mapped_column()
+    registrations_count: Mapped[int] = mapped_column(default=0, server_default="0")
 
     author: Mapped["User"] = relationship(back_populates="created_events")
     registrations: Mapped["EventRegistration"] = relationship(back_populates="event")
@@ -25,6 +35,10 @@ class Event(SqlAlchemyBase):
 
 class EventRegistration(SqlAlchemyBase):
     __tablename__ = "event_registrations"
+    __table_args__ = (
+        # One registration per user and event; also serves lookups by event.
+        UniqueConstraint("event_id", "user_id", name="uq_event_registrations_event_id_user_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[UUID] = mapped_column(
@@ -34,3 +48,35 @@ class EventRegistration(SqlAlchemyBase):
 
     user: Mapped["User"] = relationship(back_populates="registrations")
     event: Mapped["Event"] = relationship(back_populates="registrations")
+
+
+class EventWaitlistEntry(SqlAlchemyBase):
+    __tablename__ = "event_waitlist"
+    __table_args__ = (
+        UniqueConstraint("event_id", "user_id", name="uq_event_waitlist_event_id_user_id"),
+        # Queue order within an event: the lowest id is promoted first.
+        Index("ix_event_waitlist_event_id_id", "event_id", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.user_id")
+    )
+    event_id: Mapped[int] = mapped_column(ForeignKey("events.event_id"))
+
+
+class EventStatsHourly(SqlAlchemyBase):
+    """
+    Registration activity of one event within one UTC hour. Rows are
+    incremented by the registration writes themselves, so reading the stats
+    of an event never touches event_registrations.
+    """
+
+    __tablename__ = "event_stats_hourly"
+
+    event_id: Mapped[int] = mapped_column(
+        ForeignKey("events.event_id", ondelete="CASCADE"), primary_key=True
+    )
+    hour: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    registrations: Mapped[int] = mapped_column(default=0, server_default="0")
+    cancellations: Mapped[int] = mapped_column(default=0, server_default="0")
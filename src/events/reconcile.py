@@ -0,0 +1,58 @@
+"""
+Registration counter reconciliation.
+
+Walks the events table in batches of `reconcile_batch_size` events, each in
+its own short transaction, and resets registrations_count wherever it no
+longer matches the number of rows in event_registrations. Counters are kept
+up to date by every registration write, so this only repairs drift left by
+manual data fixes or a bug, and can run at any time next to the API:
+
+    python -m src.events.reconcile
+"""
+import asyncio
+import logging
+
+from src.adapters.db.db_manager import AsyncDatabaseSQLAlchemyManager
+from src.config.base_config import settings
+from src.config.db_config import database_config as db_config
+from src.events.uow import EventsStorageUnitOfWork
+
+logger = logging.getLogger("uvicorn")
+
+
+async def reconcile_counts(
+    uow: EventsStorageUnitOfWork, batch_size: int = settings.reconcile_batch_size
+) -> list[int]:
+    """
+    Fix every drifted counter. Returns the ids of the events that were fixed.
+    """
+    fixed: list[int] = []
+    after = 0
+    while True:
+        async with uow:
+            event_ids = await uow.events.lock_next(after, batch_size)
+            if not event_ids:
+                return fixed
+            batch_fixed = await uow.events.reconcile_counts(event_ids)
+            await uow.commit()
+        if batch_fixed:
+            logger.warning(f"Fixed registration counts of events {batch_fixed}")
+        fixed.extend(batch_fixed)
+        after = event_ids[-1]
+
+
+async def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    db = AsyncDatabaseSQLAlchemyManager(db_config.GET_ASYNC_DB_URL)
+    await db.connect(echo=db_config.DATABASE_ECHO)
+    await db.ensure_schema()
+    db.init_session_factory()
+    try:
+        fixed = await reconcile_counts(EventsStorageUnitOfWork(db.session_factory))
+    finally:
+        await db.disconnect()
+    logger.info(f"Registration counts reconciled, {len(fixed)} events fixed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
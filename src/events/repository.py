@@ -1,14 +1,429 @@
-from src.events.schemas import EventModel, EventRegistrationModel
+import uuid
+from collections import Counter
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import (
+    column,
+    delete,
+    exists,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    tuple_,
+    update,
+)
+
+from src.events.schemas import (
+    EventModel,
+    EventRegistrationModel,
+    EventSummary,
+    HourlyStats,
+    WaitlistEntryModel,
+)
+from src.adapters.db.dialect import insert
+from src.adapters.orm import utc_now
 from src.adapters.repository import AsyncRepository
-from src.events.orm import Event, EventRegistration
+from src.config.db_config import Dialect, database_config as db_config
+from src.events import search
+from src.events.orm import Event, EventRegistration, EventStatsHourly, EventWaitlistEntry
+from src.users.orm import User
 
 
 class EventsRepository(AsyncRepository[Event, EventModel]):
     model = Event
     schema = EventModel
 
+    async def get_page(
+        self,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        organizer: str | None = None,
+        location: str | None = None,
+    ) -> list[EventModel]:
+        """
+        Fetch one page of events ordered by (event_date, event_id), starting
+        right after the `after` key. Each filter maps onto a composite index
+        ending in (event_date, event_id), so a page is a single range scan.
+        """
+        stmt = self._select()
+        if organizer is not None:
+            stmt = stmt.where(self.model.organizer == organizer)
+        if location is not None:
+            stmt = stmt.where(self.model.location == location)
+        if date_from is not None:
+            stmt = stmt.where(self.model.event_date >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(self.model.event_date < date_to)
+        if after is not None:
+            stmt = stmt.where(tuple_(self.model.event_date, self.model.event_id) > after)
+        stmt = stmt.order_by(self.model.event_date, self.model.event_id).limit(limit)
+
+        result = await self.session.execute(stmt)
+        return [self._to_schema(item) for item in self._rows(result)]
+
+    async def search(self, terms: list[str], limit: int) -> list[EventModel]:
+        """
+        Events containing every term, best matches first, through the
+        full-text index of the configured dialect.
+        """
+        stmt = self._select()
+        if db_config.DATABASE_DIALECT == Dialect.postgresql:
+            vector = literal_column(f"events.{search.SEARCH_VECTOR}")
+            query = func.to_tsquery("simple", search.tsquery(terms))
+            stmt = stmt.where(vector.op("@@")(query)).order_by(func.ts_rank(vector, query).desc())
+        else:
+            index = table(search.SEARCH_TABLE, column("rowid"))
+            stmt = (
+                stmt.join(index, index.c.rowid == self.model.event_id)
+                .where(literal_column(search.SEARCH_TABLE).op("MATCH")(search.fts5_query(terms)))
+                .order_by(func.bm25(literal_column(search.SEARCH_TABLE), *search.FTS5_WEIGHTS))
+            )
+        stmt = stmt.order_by(self.model.event_date, self.model.event_id).limit(limit)
+
+        result = await self.session.execute(stmt)
+        return [self._to_schema(item) for item in self._rows(result)]
+
+    async def reserve_seat(self, event_id: int) -> EventSummary | None:
+        """
+        Take one seat with a single conditional UPDATE. The row lock it takes
+        makes concurrent registrations for the event queue up behind each other,
+        and each re-checks the capacity, so an event is never oversold.
+        Returns None if the event is full or does not exist.
+        """
+        stmt = (
+            update(self.model)
+            .where(
+                self.model.event_id == event_id,
+                or_(
+                    self.model.capacity.is_(None),
+                    self.model.registrations_count < self.model.capacity,
+                ),
+            )
+            .values(registrations_count=self.model.registrations_count + 1)
+            .returning(self.model.title, self.model.event_date)
+        )
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+        return EventSummary(title=row.title, event_date=row.event_date) if row else None
+
+    async def get_author_id(self, event_id: int) -> uuid.UUID | None:
+        """
+        Id of the organizer who created the event, or None if it does not exist.
+        """
+        stmt = select(self.model.author_id).where(self.model.event_id == event_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_for_update(self, event_id: int) -> EventModel | None:
+        """
+        Fetch the event and lock its row on PostgreSQL until the end of the
+        transaction, so its registrations_count cannot grow meanwhile.
+        """
+        stmt = self._select().where(self.model.event_id == event_id).with_for_update()
+        result = await self.session.execute(stmt)
+        item = self._rows(result).one_or_none()
+        return self._to_schema(item) if item is not None else None
+
+    async def free_seats(self, event_id: int) -> int | None:
+        """
+        Number of free seats, or None for an event without a capacity. Locks
+        the event row on PostgreSQL until the end of the transaction.
+        """
+        stmt = (
+            select(self.model.capacity - self.model.registrations_count)
+            .where(self.model.event_id == event_id)
+            .with_for_update()
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def lock_next(self, after: int, limit: int) -> list[int]:
+        """
+        Ids of the next `limit` events after the `after` id, locked until the
+        end of the transaction on PostgreSQL. Registration writes lock their
+        event row first, so while the lock is held, a recount of these events
+        on a fresh snapshot agrees with their counters.
+        """
+        stmt = (
+            select(self.model.event_id)
+            .where(self.model.event_id > after)
+            .order_by(self.model.event_id)
+            .limit(limit)
+            .with_for_update()
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars())
+
+    async def reconcile_counts(self, event_ids: list[int]) -> list[int]:
+        """
+        Recount the registrations of the given events, locked with lock_next,
+        and fix those whose registrations_count has drifted. Returns the ids
+        of the events that were fixed.
+        """
+        actual = (
+            select(func.count())
+            .where(EventRegistration.event_id == self.model.event_id)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(self.model)
+            .where(self.model.event_id.in_(event_ids), self.model.registrations_count != actual)
+            .values(registrations_count=actual)
+            .returning(self.model.event_id)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars())
+
+    async def add_to_count(self, event_id: int, delta: int) -> int | None:
+        """
+        Adjust registrations_count and return the number of free seats left,
+        or None for an event without a capacity.
+        """
+        stmt = (
+            update(self.model)
+            .where(self.model.event_id == event_id)
+            .values(registrations_count=self.model.registrations_count + delta)
+            .returning(self.model.capacity - self.model.registrations_count)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+
 class EventsRegistrationRepository(
     AsyncRepository[EventRegistration, EventRegistrationModel]
 ):
     model = EventRegistration
     schema = EventRegistrationModel
+
+    async def get_user_ids_by_email(self, emails: list[str]) -> dict[str, uuid.UUID]:
+        """
+        Ids of the users with the given lowercase emails, keyed by lowercase
+        email. Matching ignores the case the emails were stored in.
+        """
+        email = func.lower(User.email)
+        stmt = select(email, User.user_id).where(email.in_(emails))
+        result = await self.session.execute(stmt)
+        return {email: user_id for email, user_id in result.all()}
+
+    async def add_unique(
+        self, event_id: int, user_id: uuid.UUID
+    ) -> EventRegistrationModel | None:
+        """
+        Insert the registration unless the user is already registered for the
+        event, in which case nothing is written and None is returned.
+        """
+        stmt = (
+            insert(self.model)
+            .values(event_id=event_id, user_id=user_id)
+            .on_conflict_do_nothing(index_elements=["event_id", "user_id"])
+            .returning(*self._returning())
+        )
+        result = await self.session.execute(stmt)
+        item = self._rows(result).one_or_none()
+        return self._to_schema(item) if item is not None else None
+
+    async def get_emails(self, user_ids: list[uuid.UUID]) -> list[str]:
+        stmt = select(User.email).where(User.user_id.in_(user_ids))
+        result = await self.session.execute(stmt)
+        return list(result.scalars())
+
+    async def add_missing(self, event_id: int, user_ids: list[uuid.UUID]) -> list[uuid.UUID]:
+        """
+        Register the given users for the event with a single INSERT ... SELECT,
+        skipping users who are already registered. Returns the ids of the users
+        who were registered. ON CONFLICT covers registrations committed
+        concurrently by someone else.
+        """
+        already_registered = exists().where(
+            self.model.event_id == event_id,
+            self.model.user_id == User.user_id,
+        )
+        users = select(User.user_id, literal(event_id)).where(
+            User.user_id.in_(user_ids), ~already_registered
+        )
+        stmt = (
+            insert(self.model)
+            .from_select(["user_id", "event_id"], users)
+            .on_conflict_do_nothing(index_elements=["event_id", "user_id"])
+            .returning(self.model.user_id)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars())
+
+    async def count_by_hour(self, event_ids: list[int]) -> Counter[tuple[int, datetime]]:
+        """
+        Number of current registrations of the given events per UTC hour of
+        their creation, for rebuilding the hourly stats.
+        """
+        stmt = (
+            select(self.model.event_id, self.model.created_at)
+            .where(self.model.event_id.in_(event_ids))
+            .execution_options(yield_per=1000)
+        )
+        counts: Counter[tuple[int, datetime]] = Counter()
+        result = await self.session.stream(stmt)
+        async for rows in result.partitions():
+            counts.update(
+                (event_id, EventStatsRepository.hour_of(created_at)) for event_id, created_at in rows
+            )
+        return counts
+
+    async def stream_attendees(
+        self, event_id: int, batch_size: int = 1000
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Yield the event's registrations joined with their users through a
+        server-side cursor, `batch_size` rows at a time, without loading the
+        whole list.
+        """
+        stmt = (
+            select(
+                self.model.id.label("registration_id"),
+                User.user_id,
+                User.username,
+                User.email,
+                User.phone,
+                self.model.created_at.label("registered_at"),
+            )
+            .join(User, User.user_id == self.model.user_id)
+            .where(self.model.event_id == event_id)
+            .order_by(self.model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        # Partitions for the same reason as in AsyncRepository.stream.
+        async for rows in result.mappings().partitions():
+            for row in rows:
+                yield row
+
+
+class EventWaitlistRepository(AsyncRepository[EventWaitlistEntry, WaitlistEntryModel]):
+    model = EventWaitlistEntry
+    schema = WaitlistEntryModel
+
+    async def enqueue(self, event_id: int, user_id: uuid.UUID) -> WaitlistEntryModel:
+        """
+        Put the user at the end of the event's waitlist, or return their current
+        entry if they are already waiting.
+        """
+        stmt = (
+            insert(self.model)
+            .values(event_id=event_id, user_id=user_id)
+            .on_conflict_do_nothing(index_elements=["event_id", "user_id"])
+            .returning(self.model.id)
+        )
+        entry_id = (await self.session.execute(stmt)).scalar_one_or_none()
+        if entry_id is None:
+            existing = select(self.model.id).filter_by(event_id=event_id, user_id=user_id)
+            entry_id = (await self.session.execute(existing)).scalar_one()
+
+        position = select(func.count()).where(
+            self.model.event_id == event_id, self.model.id <= entry_id
+        )
+        return self.schema(
+            id=entry_id,
+            event_id=event_id,
+            user_id=user_id,
+            position=(await self.session.execute(position)).scalar_one(),
+        )
+
+    async def pop_next(self, event_id: int, limit: int | None) -> list[uuid.UUID]:
+        """
+        Remove up to `limit` users from the head of the waitlist (all of them
+        if `limit` is None) and return them in queue order. On PostgreSQL,
+        entries locked by a concurrent promotion are skipped.
+        """
+        stmt = (
+            select(self.model.id, self.model.user_id)
+            .where(self.model.event_id == event_id)
+            .order_by(self.model.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        entries = (await self.session.execute(stmt)).all()
+        if not entries:
+            return []
+
+        await self.session.execute(
+            delete(self.model).where(self.model.id.in_([entry.id for entry in entries]))
+        )
+        return [entry.user_id for entry in entries]
+
+
+class EventStatsRepository(AsyncRepository[EventStatsHourly, HourlyStats]):
+    model = EventStatsHourly
+    schema = HourlyStats
+
+    @staticmethod
+    def hour_of(moment: datetime) -> datetime:
+        """The UTC hour a moment falls in; naive moments are taken as UTC."""
+        moment = moment.astimezone(UTC) if moment.tzinfo else moment.replace(tzinfo=UTC)
+        return moment.replace(minute=0, second=0, microsecond=0)
+
+    async def record(
+        self, event_id: int, registrations: int = 0, cancellations: int = 0
+    ) -> None:
+        """
+        Add to the current hour of the event with a single upsert. Callers
+        have already locked the event row, so concurrent writes for one event
+        queue there and never race on the stats row.
+        """
+        stmt = insert(self.model).values(
+            event_id=event_id,
+            hour=self.hour_of(utc_now()),
+            registrations=registrations,
+            cancellations=cancellations,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["event_id", "hour"],
+            set_={
+                "registrations": self.model.registrations + stmt.excluded.registrations,
+                "cancellations": self.model.cancellations + stmt.excluded.cancellations,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def set_registrations(self, counts: Counter[tuple[int, datetime]]) -> None:
+        """
+        Overwrite the registrations of the given (event, hour) pairs, keeping
+        their cancellations, for rebuilding the stats from existing rows.
+        """
+        if not counts:
+            return
+        stmt = insert(self.model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["event_id", "hour"],
+            set_={
+                "registrations": stmt.excluded.registrations,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await self.session.execute(
+            stmt,
+            [
+                {"event_id": event_id, "hour": hour, "registrations": count, "cancellations": 0}
+                for (event_id, hour), count in counts.items()
+            ],
+        )
+
+    async def get_hours(self, event_id: int, start: datetime, end: datetime) -> list[HourlyStats]:
+        """Hours of the event from `start` up to `end`, in order."""
+        stmt = (
+            self._select()
+            .where(
+                self.model.event_id == event_id,
+                self.model.hour >= start,
+                self.model.hour < end,
+            )
+            .order_by(self.model.hour)
+        )
+        result = await self.session.execute(stmt)
+        return [self._to_schema(item) for item in self._rows(result)]
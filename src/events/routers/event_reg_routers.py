@@ -1,9 +1,16 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, Request, status
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
 from dependency_injector.wiring import Provide, inject
-from src.adapters.email import send_event_registration_email
+from src.common.http import etag_matches, make_etag, not_modified
 from src.common.security import security_service as auth_service
-from src.events.schemas import CreateEventRegistration, EventRegistrationResponse
-from src.users.schemas import PrivateUser
+from src.common.streaming import iter_json_array
+from src.events.schemas import (
+    CreateEventRegistration,
+    EventRegistrationResponse,
+    WaitlistEntryModel,
+    WaitlistEntryResponse,
+)
+from src.users.schemas import Principal
 from src.container import Container
 from src.events.service import EventsService
 
@@ -18,51 +25,74 @@ user_router = APIRouter(prefix="/registrations", tags=["Event Registrations"])
             "model": list[EventRegistrationResponse],
             "description": "Registration list retrieved successfully.",
         },
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "The list has not changed since the ETag in If-None-Match.",
+        },
     },
 )
 @inject
 async def get_registrations(
+    request: Request,
     events_service: EventsService = Depends(Provide(Container.events_service)),
-    current_user: PrivateUser = Depends(auth_service.get_current_user),
-) -> list[EventRegistrationResponse]:
+    current_user: Principal = Depends(auth_service.get_current_user),
+) -> Response:
     """
     ## Get all registrations
+
+    Polling clients should send the last ETag in If-None-Match: an unchanged
+    list is answered with 304 after a single aggregate query. The list is
+    streamed from a database cursor as it is encoded, so it can be of any length.
     """
-    registrations = await events_service.get_all_registrations(current_user.user_id)
-    return registrations
+    version = await events_service.get_registrations_version(current_user.user_id)
+    etag = make_etag(current_user.user_id, *version)
+    # Per-user data: browsers may keep it, shared caches must not.
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return not_modified(headers)
+
+    return StreamingResponse(
+        iter_json_array(events_service.stream_registrations(current_user.user_id)),
+        media_type="application/json",
+        headers=headers,
+    )
 
 
 @user_router.post(
     "/create",
-    response_model=EventRegistrationResponse,
+    response_model=EventRegistrationResponse | WaitlistEntryResponse,
     status_code=status.HTTP_201_CREATED,
     responses={
         status.HTTP_201_CREATED: {
             "model": EventRegistrationResponse,
             "description": "Registration created successfully.",
         },
+        status.HTTP_202_ACCEPTED: {
+            "model": WaitlistEntryResponse,
+            "description": "The event is full; the user was put on its waitlist.",
+        },
     },
 )
 @inject
 async def create_registration(
     body: CreateEventRegistration,
-    background_tasks: BackgroundTasks,
     request: Request,
+    response: Response,
     events_service: EventsService = Depends(Provide(Container.events_service)),
-    current_user: PrivateUser = Depends(auth_service.get_current_user),
-) -> EventRegistrationResponse:
+    current_user: Principal = Depends(auth_service.get_current_user),
+) -> EventRegistrationResponse | WaitlistEntryResponse:
     """
     ## Create a registration
+
+    When the event is full the user joins its waitlist instead, and is
+    registered automatically once a seat frees up. The confirmation email is
+    sent by the outbox worker, not by this request.
     """
-    registration, event = await events_service.create_registration(body, current_user.user_id)
-    background_tasks.add_task(
-        send_event_registration_email,
-        current_user.email,
-        event.title,
-        event.event_date,
-        str(request.base_url),
+    result = await events_service.create_registration(
+        body, current_user.user_id, current_user.email, str(request.base_url)
     )
-    return registration
+    if isinstance(result, WaitlistEntryModel):
+        response.status_code = status.HTTP_202_ACCEPTED
+    return result
 
 
 @user_router.delete(
@@ -77,11 +107,14 @@ async def create_registration(
 @inject
 async def delete_registration(
     registration_id: int,
+    request: Request,
     events_service: EventsService = Depends(Provide(Container.events_service)),
-    current_user: PrivateUser = Depends(auth_service.get_current_user),
+    current_user: Principal = Depends(auth_service.get_current_user),
 ) -> None:
     """
     ## Delete a registration
     """
-    await events_service.delete_registration(registration_id, current_user.user_id)
+    await events_service.delete_registration(
+        registration_id, current_user.user_id, str(request.base_url)
+    )
     return None
@@ -1,17 +1,43 @@
+from typing import Annotated
+
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, UploadFile, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import TypeAdapter
 
-from src.events.schemas import EventCreate, EventResponse, EventUpdate
+from src.events.schemas import (
+    EventBulkCreate,
+    EventBulkCreateResponse,
+    EventCreate,
+    EventResponse,
+    EventUpdate,
+    EventsFilter,
+    EventsSearch,
+    EventStats,
+    ExportFormat,
+    RegistrationImportSummary,
+    StatsFilter,
+)
 from src.adapters.orm import Role
-from src.events.service import EventsService
+from src.events.service import IMPORT_BATCH_SIZE, EventsService
+from src.common.streaming import iter_csv, iter_csv_batches, iter_ndjson
+from src.common.http import etag_matches, make_etag, not_modified
 from src.common.security import security_service as auth_service
 from src.container import Container
-from src.users.schemas import PrivateUser
+from src.users.schemas import Principal
 from src.events.exceptions import event_exceptions as event_exc
 
 organizer_router = APIRouter(prefix="/events", tags=["Events: <CRUD>"])
 public_router = APIRouter(prefix="/events", tags=["Events: <CRUD>"])
 
+# Public event data is the same for every client, so shared caches may keep it
+# for a few seconds; after that clients revalidate with If-None-Match.
+PUBLIC_CACHE_CONTROL = "public, max-age=5"
+
+# Serializes a page straight to JSON-ready data with the response fields only,
+# instead of FastAPI validating the service models again against response_model.
+EVENT_LIST = TypeAdapter(list[EventResponse])
+
 
 @public_router.get(
     "/",
@@ -19,21 +45,66 @@ public_router = APIRouter(prefix="/events", tags=["Events: <CRUD>"])
     responses={
         status.HTTP_200_OK: {
             "model": list[EventResponse],
-            "description": "Event list received successfully.",
+            "description": "Event list received successfully. "
+            "The X-Next-Cursor header holds the cursor of the next page, if any.",
+        },
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "The page has not changed since the ETag in If-None-Match.",
         },
     },
 )
 @inject
 async def read_events(
+    request: Request,
+    filters: Annotated[EventsFilter, Query()],
     events_service: EventsService = Depends(Provide(Container.events_service)),
-) -> list[EventResponse]:
+) -> Response:
     """
     ## Get events
+
+    Events are ordered by date. Pass the X-Next-Cursor header of a page
+    as `cursor` to fetch the next one.
     """
-    
-    events: list[EventResponse] = await events_service.get_events()
-    
-    return events
+    events, next_cursor = await events_service.get_events(filters)
+    etag = make_etag(
+        next_cursor,
+        *((event.event_id, event.updated_at.isoformat()) for event in events),
+    )
+    headers = {"ETag": etag, "Cache-Control": PUBLIC_CACHE_CONTROL}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = next_cursor
+    if etag_matches(request, etag):
+        return not_modified(headers)
+
+    return ORJSONResponse(EVENT_LIST.dump_python(events), headers=headers)
+
+
+# Declared before "/{event_id}", which would otherwise take "search" for an id.
+@public_router.get(
+    "/search",
+    response_model=list[EventResponse],
+    responses={
+        status.HTTP_200_OK: {
+            "model": list[EventResponse],
+            "description": "Matching events, best matches first.",
+        },
+    },
+)
+@inject
+async def search_events(
+    search: Annotated[EventsSearch, Query()],
+    events_service: EventsService = Depends(Provide(Container.events_service)),
+) -> Response:
+    """
+    ## Search events
+
+    Full-text search over the title, description, location and organizer.
+    Title matches rank highest.
+    """
+    events = await events_service.search_events(search)
+    return ORJSONResponse(
+        EVENT_LIST.dump_python(events), headers={"Cache-Control": PUBLIC_CACHE_CONTROL}
+    )
 
 
 @public_router.get(
@@ -44,18 +115,28 @@ async def read_events(
             "model": EventResponse,
             "description": "Event received successfully.",
         },
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "The event has not changed since the ETag in If-None-Match.",
+        },
     },
 )
 @inject
 async def read_event(
     event_id: int,
+    request: Request,
+    response: Response,
     events_service: EventsService = Depends(Provide(Container.events_service)),
-) -> EventResponse:
+) -> EventResponse | Response:
     """
     ## Get event
     """
-    event: EventResponse = await events_service.get_event_by_id(event_id=event_id)
+    event = await events_service.get_event_by_id(event_id=event_id)
+    etag = make_etag(event.event_id, event.updated_at.isoformat())
+    headers = {"ETag": etag, "Cache-Control": PUBLIC_CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return not_modified(headers)
 
+    response.headers.update(headers)
     return event
 
 
@@ -74,18 +155,48 @@ async def read_event(
 async def create_event(
     body: EventCreate,
     events_service: EventsService = Depends(Provide(Container.events_service)),
-    current_user: PrivateUser = Depends(auth_service.get_current_user),
+    current_user: Principal = Depends(auth_service.get_current_user),
 ) -> EventResponse:
     """
     ## Create a new event.
     """
     if current_user.role == Role.organizer:
-        new_event: PrivateUser = await events_service.create_event(body, current_user.user_id)
+        new_event: EventResponse = await events_service.create_event(body, current_user.user_id)
     else:
         raise event_exc.ForbiddenError()
     return new_event
 
 
+@organizer_router.post(
+    "/bulk",
+    response_model=EventBulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_201_CREATED: {
+            "model": EventBulkCreateResponse,
+            "description": "Valid events were created; invalid ones are listed in errors.",
+        },
+    },
+)
+@inject
+async def create_events(
+    body: EventBulkCreate,
+    events_service: EventsService = Depends(Provide(Container.events_service)),
+    current_user: Principal = Depends(auth_service.get_current_user),
+) -> EventBulkCreateResponse:
+    """
+    ## Create events in bulk
+
+    Every item is validated on its own. Valid items are inserted in one
+    transaction; invalid items are reported by their index in the request.
+    """
+    if current_user.role == Role.organizer:
+        created, errors = await events_service.create_events(body, current_user.user_id)
+    else:
+        raise event_exc.ForbiddenError()
+    return EventBulkCreateResponse(created=created, errors=errors)
+
+
 @organizer_router.put(
     "/{event_id}",
     response_model=EventResponse,
@@ -94,11 +205,14 @@ async def create_event(
 async def update_event(
     event_id: int,
     body: EventUpdate,
+    request: Request,
     events_service: EventsService = Depends(Provide(Container.events_service)),
-    current_user: PrivateUser = Depends(auth_service.get_current_user),
+    current_user: Principal = Depends(auth_service.get_current_user),
 ) -> EventResponse:
     if current_user.role == Role.organizer:
-        updated_event: EventResponse = await events_service.update_event(event_id, current_user.user_id, body)
+        updated_event: EventResponse = await events_service.update_event(
+            event_id, current_user.user_id, body, str(request.base_url)
+        )
     else:
         raise event_exc.ForbiddenError()
     return updated_event
@@ -112,7 +226,7 @@ async def update_event(
 async def remove_event(
     event_id: int,
     events_service: EventsService = Depends(Provide(Container.events_service)),
-    current_user: PrivateUser = Depends(auth_service.get_current_user),
+    current_user: Principal = Depends(auth_service.get_current_user),
 ) -> None:
     """
     ## Delete event
@@ -122,3 +236,112 @@ async def remove_event(
     else:
         raise event_exc.ForbiddenError()
     return None
+
+
+@organizer_router.post(
+    "/{event_id}/registrations/import",
+    response_model=RegistrationImportSummary,
+    responses={
+        status.HTTP_200_OK: {
+            "model": RegistrationImportSummary,
+            "description": "Attendee list imported.",
+        },
+    },
+)
+@inject
+async def import_registrations(
+    event_id: int,
+    file: UploadFile,
+    events_service: EventsService = Depends(Provide(Container.events_service)),
+    current_user: Principal = Depends(auth_service.get_current_user),
+) -> RegistrationImportSummary:
+    """
+    ## Import registrations from CSV
+
+    The file needs a header row with an `email` column; other columns are ignored.
+    Users who are already registered are skipped, so the same file can be
+    uploaded again safely. Emails are matched without regard to case. No
+    confirmation emails are sent. Only the organizer who created the event can
+    import into it.
+    """
+    if current_user.role != Role.organizer:
+        raise event_exc.ForbiddenError()
+    try:
+        return await events_service.import_registrations(
+            event_id, current_user.user_id, iter_csv_batches(file, batch_size=IMPORT_BATCH_SIZE)
+        )
+    except UnicodeDecodeError as e:
+        raise event_exc.InvalidImportFileError() from e
+
+
+@organizer_router.get(
+    "/{event_id}/stats",
+    response_model=EventStats,
+    responses={
+        status.HTTP_200_OK: {
+            "model": EventStats,
+            "description": "Registration activity of the event.",
+        },
+    },
+)
+@inject
+async def read_event_stats(
+    event_id: int,
+    filters: Annotated[StatsFilter, Query()],
+    events_service: EventsService = Depends(Provide(Container.events_service)),
+    current_user: Principal = Depends(auth_service.get_current_user),
+) -> EventStats:
+    """
+    ## Event registration stats
+
+    Registrations and cancellations per day and per UTC hour, with their
+    totals over the report range and the current number of registrations.
+    Only the organizer who created the event can read them.
+    """
+    if current_user.role != Role.organizer:
+        raise event_exc.ForbiddenError()
+    return await events_service.get_event_stats(event_id, current_user.user_id, filters)
+
+
+ATTENDEE_COLUMNS = ("registration_id", "user_id", "username", "email", "phone", "registered_at")
+
+
+@organizer_router.get(
+    "/{event_id}/registrations/export",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+            "description": "Attendee list, streamed row by row.",
+        },
+    },
+)
+@inject
+async def export_registrations(
+    event_id: int,
+    format: ExportFormat = ExportFormat.ndjson,
+    events_service: EventsService = Depends(Provide(Container.events_service)),
+    current_user: Principal = Depends(auth_service.get_current_user),
+) -> StreamingResponse:
+    """
+    ## Export registrations
+
+    Streams the event's attendees as NDJSON (one JSON object per line) or CSV.
+    Rows are read from a server-side cursor, so the export size is not limited by memory.
+    Only the organizer who created the event can export it.
+    """
+    if current_user.role != Role.organizer:
+        raise event_exc.ForbiddenError()
+
+    rows = await events_service.export_registrations(event_id, current_user.user_id)
+    if format == ExportFormat.csv:
+        body, media_type = iter_csv(ATTENDEE_COLUMNS, rows), "text/csv"
+    else:
+        body, media_type = iter_ndjson(rows), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="event-{event_id}-registrations.{format}"'
+        },
+    )
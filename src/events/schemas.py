@@ -1,7 +1,14 @@
 import uuid
-from pydantic import BaseModel, Field, PositiveInt, FutureDate
+from datetime import UTC, date, datetime
+from enum import StrEnum
+from typing import Any
 
-class EventCreate(BaseModel):
+from pydantic import BaseModel, Field, PositiveInt, FutureDate, field_validator
+
+MAX_BULK_EVENTS = 10_000
+MAX_STATS_DAYS = 92
+
+class EventBase(BaseModel):
     title: str = Field(
         examples=["Tech Conference 2024"],
         min_length=2,
@@ -15,7 +22,7 @@ class EventCreate(BaseModel):
         max_length=255,
         description="A brief description of the event. Optional field.",
     )
-    event_date: FutureDate = Field(
+    event_date: date = Field(
         examples=["2024-05-15"],
         description="The date when the event is scheduled to take place.",
     )
@@ -31,19 +38,130 @@ class EventCreate(BaseModel):
         max_length=100,
         description="The name of the individual or organization organizing the event.",
     )
+    capacity: PositiveInt | None = Field(
+        examples=[500],
+        default=None,
+        description="Maximum number of registrations. Leave empty for no limit; "
+        "once the event is full, new registrants join the waitlist.",
+    )
+
+
+class EventCreate(EventBase):
+    event_date: FutureDate = Field(
+        examples=["2024-05-15"],
+        description="The date when the event is scheduled to take place.",
+    )
+
 
+class EventSummary(BaseModel):
+    title: str
+    event_date: date
 
-class EventResponse(EventCreate):
+
+class EventResponse(EventBase):
     event_id: PositiveInt = Field(
         examples=[1],
         description="Unique identifier for the event.",
     )
+    registrations_count: int = Field(
+        default=0,
+        examples=[42],
+        description="Number of users registered for the event. "
+        "On event lists it may lag behind by a few seconds.",
+    )
+
+
+class EventUpdate(EventCreate):
+    capacity: PositiveInt | None = Field(
+        examples=[500],
+        default=None,
+        description="Maximum number of registrations, not below the current number "
+        "of registrations. Send null to remove the limit; leave out to keep it.",
+    )
+
+
+class EventModel(EventResponse):
+    updated_at: datetime
+
+
+class EventBulkCreate(BaseModel):
+    # Items are validated one by one by the service, so a single bad item
+    # is reported back instead of rejecting the whole batch.
+    events: list[dict[str, Any]] = Field(
+        min_length=1,
+        max_length=MAX_BULK_EVENTS,
+        description="Events to create, each in the EventCreate format.",
+    )
 
 
-class EventUpdate(EventCreate): ...
+class EventBulkItemError(BaseModel):
+    index: int = Field(
+        examples=[3],
+        description="Position of the rejected item in the request.",
+    )
+    errors: list[dict[str, Any]] = Field(
+        description="Validation errors of the item.",
+    )
 
 
-class EventModel(EventResponse): ...
+class EventBulkCreateResponse(BaseModel):
+    created: list[EventResponse] = Field(
+        description="Created events, in request order.",
+    )
+    errors: list[EventBulkItemError] = Field(
+        description="Items that failed validation and were not created.",
+    )
+
+
+class EventsFilter(BaseModel):
+    limit: int = Field(
+        default=50,
+        ge=1,
+        le=100,
+        description="Maximum number of events on the page.",
+    )
+    cursor: str | None = Field(
+        default=None,
+        description="Opaque cursor taken from the X-Next-Cursor header of the previous page.",
+    )
+    date_from: date | None = Field(
+        examples=["2024-05-01"],
+        default=None,
+        description="Only events taking place on or after this date.",
+    )
+    date_to: date | None = Field(
+        examples=["2024-05-31"],
+        default=None,
+        description="Only events taking place on or before this date.",
+    )
+    organizer: str | None = Field(
+        examples=["Tech Innovators Inc."],
+        default=None,
+        max_length=100,
+        description="Only events organized by this organizer.",
+    )
+    location: str | None = Field(
+        examples=["Kyiv Expo Plaza"],
+        default=None,
+        max_length=255,
+        description="Only events held at this location.",
+    )
+
+
+class EventsSearch(BaseModel):
+    q: str = Field(
+        examples=["python meetup kyiv"],
+        min_length=1,
+        max_length=200,
+        description="Words to look for in the title, description, location and organizer. "
+        "Every word must match; the end of a word may be left out.",
+    )
+    limit: int = Field(
+        default=20,
+        ge=1,
+        le=100,
+        description="Maximum number of events returned, best matches first.",
+    )
 
 
 class CreateEventRegistration(BaseModel):
@@ -66,3 +184,115 @@ class EventRegistrationResponse(CreateEventRegistration):
 
 
 class EventRegistrationModel(EventRegistrationResponse): ...
+
+
+class WaitlistEntryResponse(CreateEventRegistration):
+    id: PositiveInt = Field(
+        examples=[7],
+        description="Unique identifier for the waitlist entry.",
+    )
+    user_id: uuid.UUID = Field(
+        examples=["550e8400-e29b-41d4-a716-446655440000"],
+        description="The unique identifier of the waiting user.",
+    )
+    position: PositiveInt = Field(
+        examples=[3],
+        description="Place in the queue; 1 is promoted when the next seat frees up.",
+    )
+
+
+class WaitlistEntryModel(WaitlistEntryResponse): ...
+
+
+class RegistrationImportSummary(BaseModel):
+    rows: int = Field(
+        examples=[1200],
+        description="Number of attendee rows read from the file.",
+    )
+    created: int = Field(
+        examples=[1150],
+        description="Registrations created by this import.",
+    )
+    already_registered: int = Field(
+        examples=[30],
+        description="Rows whose user was already registered, including repeated rows.",
+    )
+    unknown_emails: int = Field(
+        examples=[15],
+        description="Rows whose email does not belong to any user.",
+    )
+    invalid_rows: int = Field(
+        examples=[5],
+        description="Rows without an email.",
+    )
+    unknown_emails_sample: list[str] = Field(
+        examples=[["unknown@example.com"]],
+        description="Up to 100 of the unknown emails.",
+    )
+
+
+class ExportFormat(StrEnum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class StatsFilter(BaseModel):
+    date_from: date | None = Field(
+        examples=["2024-05-01"],
+        default=None,
+        description="First day of the report, in UTC. Defaults to six days before date_to.",
+    )
+    date_to: date | None = Field(
+        examples=["2024-05-07"],
+        default=None,
+        description=f"Last day of the report, in UTC. Defaults to today. "
+        f"A report covers at most {MAX_STATS_DAYS} days.",
+    )
+
+
+class StatsBucket(BaseModel):
+    registrations: int = Field(
+        default=0,
+        description="Registrations made, including waitlist promotions and imports.",
+    )
+    cancellations: int = Field(
+        default=0,
+        description="Registrations cancelled.",
+    )
+
+
+class HourlyStats(StatsBucket):
+    hour: datetime = Field(
+        description="Start of the UTC hour.",
+    )
+
+    @field_validator("hour")
+    @classmethod
+    def _utc(cls, value: datetime) -> datetime:
+        # SQLite returns the stored UTC hours without their time zone.
+        return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+class DailyStats(StatsBucket):
+    day: date
+
+
+class EventStats(BaseModel):
+    event_id: PositiveInt
+    registrations_count: int = Field(
+        description="Users registered for the event right now.",
+    )
+    date_from: date
+    date_to: date
+    registrations: int = Field(
+        description="Registrations made over the report range.",
+    )
+    cancellations: int = Field(
+        description="Registrations cancelled over the report range.",
+    )
+    days: list[DailyStats] = Field(
+        description="Every day of the report, including days without activity.",
+    )
+    hours: list[HourlyStats] = Field(
+        description="Hours with any activity, in order.",
+    )
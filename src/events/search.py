@@ -0,0 +1,103 @@
+"""
+Full-text search over events.
+
+SQLite keeps an FTS5 index in the `events_search` table, an external-content
+table over `events` that triggers update on every insert, update and delete.
+PostgreSQL keeps a weighted `tsvector` in the generated `events.search_vector`
+column with a GIN index on it. Either way the database maintains the index,
+so every write path, bulk inserts included, keeps it in sync.
+
+Both use the `simple` configuration (no stemming): every word of the query
+must appear in the event, and the last characters of a word may be missing,
+so "conf kyi" matches "Conference in Kyiv". Matches in the title weigh most,
+then location and organizer, then the description.
+"""
+import re
+
+from sqlalchemy import Connection, text
+
+SEARCH_TABLE = "events_search"
+SEARCH_VECTOR = "search_vector"
+
+# Words of a query beyond this are ignored.
+MAX_TERMS = 8
+
+# bm25 weights, in the column order of the FTS5 table.
+FTS5_WEIGHTS = (10.0, 1.0, 2.0, 2.0)
+
+_WORD = re.compile(r"\w+")
+
+_SQLITE_INDEX = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        title, description, location, organizer,
+        content='events', content_rowid='event_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_insert AFTER INSERT ON events BEGIN
+        INSERT INTO {SEARCH_TABLE} (rowid, title, description, location, organizer)
+        VALUES (new.event_id, new.title, new.description, new.location, new.organizer);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_delete AFTER DELETE ON events BEGIN
+        INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}, rowid, title, description, location, organizer)
+        VALUES ('delete', old.event_id, old.title, old.description, old.location, old.organizer);
+    END
+    """,
+    # Only changes to the indexed columns touch the index, not seat counting.
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_update
+    AFTER UPDATE OF title, description, location, organizer ON events BEGIN
+        INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}, rowid, title, description, location, organizer)
+        VALUES ('delete', old.event_id, old.title, old.description, old.location, old.organizer);
+        INSERT INTO {SEARCH_TABLE} (rowid, title, description, location, organizer)
+        VALUES (new.event_id, new.title, new.description, new.location, new.organizer);
+    END
+    """,
+    # Index the events that existed before the table did.
+    f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('rebuild')",
+)
+
+_POSTGRESQL_INDEX = (
+    f"""
+    ALTER TABLE events ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR} tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(location, '')), 'B')
+        || setweight(to_tsvector('simple', coalesce(organizer, '')), 'B')
+        || setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    f"CREATE INDEX IF NOT EXISTS ix_events_{SEARCH_VECTOR} ON events USING GIN ({SEARCH_VECTOR})",
+)
+
+
+def create_search_index(connection: Connection) -> None:
+    """
+    Create the full-text index of the connection's dialect and index the
+    existing events. Safe to run on a database that already has it.
+    """
+    statements = _POSTGRESQL_INDEX if connection.dialect.name == "postgresql" else _SQLITE_INDEX
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def search_terms(query: str) -> list[str]:
+    """
+    Split a search query into lower-case words. Everything else is dropped,
+    so the query syntax of either database cannot be injected.
+    """
+    return _WORD.findall(query.lower())[:MAX_TERMS]
+
+
+def fts5_query(terms: list[str]) -> str:
+    """FTS5 MATCH expression requiring every term, each as a prefix."""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def tsquery(terms: list[str]) -> str:
+    """to_tsquery expression requiring every term, each as a prefix."""
+    return " & ".join(f"{term}:*" for term in terms)
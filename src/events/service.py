@@ -1,25 +1,131 @@
 import uuid
-from src.events.schemas import CreateEventRegistration, EventCreate, EventModel, EventRegistrationModel, EventUpdate
+from collections.abc import AsyncIterator
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Any
+
+from pydantic import EmailStr, ValidationError
+
+from src.adapters.email import event_registration_email
+from src.common.pagination import decode_cursor, encode_cursor
+from src.events.cache import (
+    event_cache,
+    event_page_cache,
+    forget_event,
+    invalidate_event,
+    invalidate_pages,
+    page_key,
+)
+from src.events.schemas import (
+    MAX_STATS_DAYS,
+    CreateEventRegistration,
+    DailyStats,
+    EventBulkCreate,
+    EventBulkItemError,
+    EventCreate,
+    EventModel,
+    EventRegistrationModel,
+    EventUpdate,
+    EventsFilter,
+    EventsSearch,
+    EventStats,
+    RegistrationImportSummary,
+    StatsFilter,
+    WaitlistEntryModel,
+)
+from src.events.search import search_terms
 from src.events.uow import EventsStorageUnitOfWork
 from src.events.exceptions import event_exceptions as event_err
 
 
+IMPORT_BATCH_SIZE = 1000
+UNKNOWN_EMAILS_SAMPLE_SIZE = 100
+
+
 class EventsService:
     def __init__(self, uow: EventsStorageUnitOfWork):
         self.uow = uow
 
-    async def get_events(self) -> list[EventModel]:
-        async with self.uow:
-            events = await self.uow.events.get_all()
-        return events
+    async def get_events(self, filters: EventsFilter) -> tuple[list[EventModel], str | None]:
+        """
+        Return one page of events and the cursor of the next page,
+        or None when this is the last page.
+        """
+        key = page_key(filters)
+        page = event_page_cache.get(key)
+        if page is not None:
+            return page
+
+        after = self._parse_cursor(filters.cursor) if filters.cursor else None
+        date_from = self._start_of_day(filters.date_from) if filters.date_from else None
+        date_to = (
+            self._start_of_day(filters.date_to + timedelta(days=1))
+            if filters.date_to
+            else None
+        )
+
+        async with self.uow.read_only():
+            events = await self.uow.events.get_page(
+                limit=filters.limit + 1,
+                after=after,
+                date_from=date_from,
+                date_to=date_to,
+                organizer=filters.organizer,
+                location=filters.location,
+            )
+
+        next_cursor = None
+        if len(events) > filters.limit:
+            events = events[: filters.limit]
+            last = events[-1]
+            next_cursor = encode_cursor(last.event_date.isoformat(), str(last.event_id))
+
+        event_page_cache.set(key, (events, next_cursor))
+        return events, next_cursor
+
+    async def search_events(self, search: EventsSearch) -> list[EventModel]:
+        """
+        Full-text search over events, best matches first. A query without a
+        single word matches nothing.
+        """
+        terms = search_terms(search.q)
+        if not terms:
+            return []
+        async with self.uow.read_only():
+            return await self.uow.events.search(terms, search.limit)
+
+    async def warm_cache(self) -> None:
+        """
+        Load the upcoming events and the default listing page into the cache,
+        so a burst of anonymous traffic after startup does not reach the database.
+        """
+        upcoming, _ = await self.get_events(EventsFilter(date_from=date.today(), limit=100))
+        for event in upcoming:
+            event_cache.set(event.event_id, event)
+        await self.get_events(EventsFilter())
+
+    @staticmethod
+    def _start_of_day(day: date) -> datetime:
+        return datetime.combine(day, time.min)
+
+    def _parse_cursor(self, cursor: str) -> tuple[datetime, int]:
+        try:
+            event_date, event_id = decode_cursor(cursor, size=2)
+            return self._start_of_day(date.fromisoformat(event_date)), int(event_id)
+        except ValueError as e:
+            raise event_err.InvalidCursorError() from e
     
     async def get_event_by_id(self, event_id: int) -> EventModel:
-        async with self.uow:
+        event = event_cache.get(event_id)
+        if event is not None:
+            return event
+
+        async with self.uow.read_only():
             event = await self.uow.events.get_one(event_id=event_id)
             if event is None:
                 raise event_err.EventNotFoundError()
-            return event
-        
+        event_cache.set(event_id, event)
+        return event
+
     async def create_event(self, body: EventCreate, user_id: uuid.UUID) -> EventModel:
         async with self.uow:
             data = body.model_dump()
@@ -27,19 +133,66 @@ class EventsService:
 
             event = await self.uow.events.add_one(data=data)
             await self.uow.commit()
-            return event
+        invalidate_event(event.event_id)
+        return event
+
+    async def create_events(
+        self, body: EventBulkCreate, user_id: uuid.UUID
+    ) -> tuple[list[EventModel], list[EventBulkItemError]]:
+        """
+        Validate every item and insert the valid ones in a single transaction.
+        Invalid items are returned as errors and do not block the others.
+        """
+        rows: list[dict] = []
+        errors: list[EventBulkItemError] = []
+        for index, item in enumerate(body.events):
+            try:
+                event = EventCreate.model_validate(item)
+            except ValidationError as e:
+                errors.append(
+                    EventBulkItemError(
+                        index=index,
+                        errors=e.errors(include_url=False, include_context=False),
+                    )
+                )
+                continue
+            data = event.model_dump()
+            data["author_id"] = user_id
+            rows.append(data)
+
+        if not rows:
+            return [], errors
+
+        async with self.uow:
+            events = await self.uow.events.add_many(rows)
+            await self.uow.commit()
+        invalidate_pages()
+        return events, errors
             
-    async def update_event(self, event_id: int, user_id: uuid.UUID, body: EventUpdate) -> EventModel:
+    async def update_event(
+        self, event_id: int, user_id: uuid.UUID, body: EventUpdate, host: str
+    ) -> EventModel:
         async with self.uow:
-            event = await self.uow.events.get_one(event_id=event_id)
+            event = await self.uow.events.get_for_update(event_id)
             if event is None:
                 raise event_err.EventNotFoundError()
-            data = body.model_dump()
+            # A capacity left out of the request keeps the current one.
+            data = body.model_dump(
+                exclude=None if "capacity" in body.model_fields_set else {"capacity"}
+            )
+            capacity = data.get("capacity", event.capacity)
+            if capacity is not None and capacity < event.registrations_count:
+                raise event_err.CapacityBelowRegistrationsError()
             data["author_id"] = user_id
             updated_event = await self.uow.events.update_one(
                 data=data, event_id=event_id
             )
+            # A raised or removed capacity may free seats for waiting users.
+            await self._promote_waitlist(
+                event_id, await self.uow.events.free_seats(event_id), host
+            )
             await self.uow.commit()
+        invalidate_event(event_id)
         return updated_event
     
     async def remove_user(self, event_id: int) -> None:
@@ -50,42 +203,67 @@ class EventsService:
             
             await self.uow.events.delete_one(event_id=event_id)
             await self.uow.commit()
+        invalidate_event(event_id)
 
-    async def get_all_registrations(
-        self, user_id: uuid.UUID
-    ) -> list[EventRegistrationModel]:
-        async with self.uow:
-            registrations = await self.uow.registrations.get_all(
-                user_id=user_id
-            )
-            return registrations
+    async def stream_registrations(self, user_id: uuid.UUID) -> AsyncIterator[dict[str, Any]]:
+        """
+        Iterate over the user's registrations as plain rows. Like the attendee
+        export, the iterator opens its own unit of work and keeps the cursor
+        open until it is exhausted, so it can be handed to a streaming response.
+        """
+        async with self.uow.read_only():
+            async for row in self.uow.registrations.stream(user_id=user_id):
+                yield row
+
+    async def get_registrations_version(self, user_id: uuid.UUID) -> tuple:
+        """
+        Version of the user's registration list, cheap enough to check on every poll.
+        """
+        async with self.uow.read_only():
+            return await self.uow.registrations.get_version(user_id=user_id)
 
     async def create_registration(
-        self, body: CreateEventRegistration, user_id: uuid.UUID
-    ) -> tuple[EventRegistrationModel, EventModel]:
+        self, body: CreateEventRegistration, user_id: uuid.UUID, email: EmailStr, host: str
+    ) -> EventRegistrationModel | WaitlistEntryModel:
+        """
+        Take a seat and register the user, or put them on the waitlist when
+        the event is full. A duplicate registration rolls the seat back.
+        The confirmation email is queued in the outbox in the same transaction.
+        """
         async with self.uow:
-            event = await self.uow.events.get_one(event_id=body.event_id)
+            event = await self.uow.events.reserve_seat(body.event_id)
             if event is None:
-                raise event_err.EventNotFoundError()
-            
-            existing_registration = await self.uow.registrations.get_one(
-                user_id=user_id, event_id=body.event_id
-            )
-            if existing_registration:
-                raise event_err.RegistrationAlreadyExistsError()
+                # Only the failure path pays for more queries, to tell the cases apart.
+                if await self.uow.registrations.get_one(user_id=user_id, event_id=body.event_id):
+                    raise event_err.RegistrationAlreadyExistsError()
+                # A cancellation committed since the first try may have freed a
+                # seat and found nobody waiting. Retry under the event row lock,
+                # which also makes later cancellations see this user waiting.
+                if await self.uow.events.get_for_update(body.event_id) is None:
+                    raise event_err.EventNotFoundError()
+                event = await self.uow.events.reserve_seat(body.event_id)
+            if event is None:
+                entry = await self.uow.waitlist.enqueue(body.event_id, user_id)
+                await self.uow.commit()
+                return entry
 
-            data = body.model_dump()
-            data["user_id"] = user_id
-            registration = await self.uow.registrations.add_one(data)
+            registration = await self.uow.registrations.add_unique(body.event_id, user_id)
+            if registration is None:
+                raise event_err.RegistrationAlreadyExistsError()
+            await self.uow.stats.record(body.event_id, registrations=1)
+            await self.uow.outbox.enqueue(
+                [event_registration_email(email, event.title, event.event_date, host)]
+            )
             await self.uow.commit()
-            event = await self.uow.events.get_one(event_id=registration.event_id)
-            if event is None:
-                raise event_err.EventNotFoundError()
-            return registration, event
+            forget_event(body.event_id)
+            return registration
 
     async def delete_registration(
-        self, registration_id: int, user_id: uuid.UUID
+        self, registration_id: int, user_id: uuid.UUID, host: str
     ) -> None:
+        """
+        Delete the registration and hand the freed seat to the head of the waitlist.
+        """
         async with self.uow:
             registration = await self.uow.registrations.get_one(
                 id=registration_id, user_id=user_id
@@ -94,4 +272,183 @@ class EventsService:
                 raise event_err.ForbiddenError()
 
             await self.uow.registrations.delete_one(id=registration_id)
-            await self.uow.commit()
\ No newline at end of file
+            free_seats = await self.uow.events.add_to_count(registration.event_id, -1)
+            await self.uow.stats.record(registration.event_id, cancellations=1)
+            await self._promote_waitlist(registration.event_id, free_seats, host)
+            await self.uow.commit()
+        forget_event(registration.event_id)
+
+    async def _promote_waitlist(self, event_id: int, free_seats: int | None, host: str) -> None:
+        """
+        Register up to `free_seats` waiting users, or all of them when the event
+        has no capacity, and queue their confirmation emails. Must run in the
+        caller's unit of work, after the event row has been locked by an update of it.
+        """
+        if free_seats is not None and free_seats <= 0:
+            return
+        promoted: list[uuid.UUID] = []
+        # Users who were registered meanwhile only leave the waitlist, so keep
+        # popping until the seats are taken or nobody is left waiting.
+        while True:
+            limit = None if free_seats is None else free_seats - len(promoted)
+            user_ids = await self.uow.waitlist.pop_next(event_id, limit=limit)
+            if not user_ids:
+                break
+            promoted += await self.uow.registrations.add_missing(event_id, user_ids)
+            if limit is None or len(user_ids) < limit or len(promoted) == free_seats:
+                break
+        if not promoted:
+            return
+        await self.uow.events.add_to_count(event_id, len(promoted))
+        await self.uow.stats.record(event_id, registrations=len(promoted))
+        event = await self.uow.events.get_one(event_id=event_id)
+        await self.uow.outbox.enqueue(
+            [
+                event_registration_email(email, event.title, event.event_date, host)
+                for email in await self.uow.registrations.get_emails(promoted)
+            ]
+        )
+
+    async def get_event_stats(
+        self, event_id: int, user_id: uuid.UUID, filters: StatsFilter
+    ) -> EventStats:
+        """
+        Registration activity of the event per day and per hour over the
+        requested days, read from the hourly rollup only, so the cost depends
+        on the number of days and not on the number of registrations.
+        """
+        date_to = filters.date_to or datetime.now(UTC).date()
+        date_from = filters.date_from or date_to - timedelta(days=6)
+        days = (date_to - date_from).days + 1
+        if not 1 <= days <= MAX_STATS_DAYS:
+            raise event_err.InvalidStatsRangeError(
+                f"date_from must not be after date_to, and a report covers at most "
+                f"{MAX_STATS_DAYS} days."
+            )
+
+        async with self.uow.read_only():
+            await self._check_author(event_id, user_id)
+            event = await self.uow.events.get_one(event_id=event_id)
+            hours = await self.uow.stats.get_hours(
+                event_id,
+                datetime.combine(date_from, time.min, tzinfo=UTC),
+                datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=UTC),
+            )
+
+        daily = {
+            day: DailyStats(day=day)
+            for day in (date_from + timedelta(days=n) for n in range(days))
+        }
+        for hour in hours:
+            bucket = daily[hour.hour.date()]
+            bucket.registrations += hour.registrations
+            bucket.cancellations += hour.cancellations
+        return EventStats(
+            event_id=event_id,
+            registrations_count=event.registrations_count,
+            date_from=date_from,
+            date_to=date_to,
+            registrations=sum(day.registrations for day in daily.values()),
+            cancellations=sum(day.cancellations for day in daily.values()),
+            days=list(daily.values()),
+            hours=hours,
+        )
+
+    async def _check_author(self, event_id: int, user_id: uuid.UUID) -> None:
+        """
+        Make sure the event exists and was created by the user. Must run in
+        the caller's unit of work.
+        """
+        author_id = await self.uow.events.get_author_id(event_id)
+        if author_id is None:
+            raise event_err.EventNotFoundError()
+        if author_id != user_id:
+            raise event_err.ForbiddenError()
+
+    async def export_registrations(
+        self, event_id: int, user_id: uuid.UUID
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Check that the event exists and belongs to the user, and return an
+        iterator over its attendees. The iterator opens its own unit of work and
+        keeps the cursor open until it is exhausted, so it can be handed to a
+        streaming response.
+        """
+        async with self.uow.read_only():
+            await self._check_author(event_id, user_id)
+        return self._stream_attendees(event_id)
+
+    async def _stream_attendees(self, event_id: int) -> AsyncIterator[dict[str, Any]]:
+        async with self.uow.read_only():
+            async for row in self.uow.registrations.stream_attendees(event_id):
+                yield row
+
+    async def import_registrations(
+        self, event_id: int, user_id: uuid.UUID, batches: AsyncIterator[list[list[str]]]
+    ) -> RegistrationImportSummary:
+        """
+        Register the users listed in a CSV file for the event. The first record
+        is the header and must have an `email` column. Each batch is resolved
+        with one query and inserted with one more, and committed on its own, so
+        an interrupted import can simply be uploaded again. No emails are sent.
+        Imports are not limited by the event capacity, so organizers can overbook.
+        """
+        summary = RegistrationImportSummary(
+            rows=0,
+            created=0,
+            already_registered=0,
+            unknown_emails=0,
+            invalid_rows=0,
+            unknown_emails_sample=[],
+        )
+        email_column: int | None = None
+
+        async with self.uow:
+            await self._check_author(event_id, user_id)
+
+            async for batch in batches:
+                if email_column is None:
+                    email_column = self._email_column(batch.pop(0))
+
+                emails: list[str] = []
+                for record in batch:
+                    # Emails are matched without regard to case.
+                    email = record[email_column] if len(record) > email_column else ""
+                    email = email.strip().lower()
+                    if email:
+                        emails.append(email)
+                    else:
+                        summary.invalid_rows += 1
+                summary.rows += len(batch)
+                if not emails:
+                    continue
+
+                user_ids = await self.uow.registrations.get_user_ids_by_email(
+                    list(dict.fromkeys(emails))
+                )
+                created = len(
+                    await self.uow.registrations.add_missing(event_id, list(user_ids.values()))
+                )
+                await self.uow.events.add_to_count(event_id, created)
+                if created:
+                    await self.uow.stats.record(event_id, registrations=created)
+                await self.uow.commit()
+
+                unknown = [email for email in emails if email not in user_ids]
+                summary.created += created
+                summary.already_registered += len(emails) - len(unknown) - created
+                summary.unknown_emails += len(unknown)
+                free = UNKNOWN_EMAILS_SAMPLE_SIZE - len(summary.unknown_emails_sample)
+                summary.unknown_emails_sample.extend(unknown[:free])
+
+        if email_column is None:
+            raise event_err.InvalidImportFileError()
+        forget_event(event_id)
+        return summary
+
+    @staticmethod
+    def _email_column(header: list[str]) -> int:
+        columns = [column.strip().lower() for column in header]
+        if "email" not in columns:
+            raise event_err.InvalidImportFileError()
+        return columns.index("email")
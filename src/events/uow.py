@@ -1,17 +1,31 @@
 from typing import Self
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from src.events.repository import EventsRegistrationRepository, EventsRepository
+from src.events.repository import (
+    EventsRegistrationRepository,
+    EventsRepository,
+    EventStatsRepository,
+    EventWaitlistRepository,
+)
+from src.adapters.db.replica import ReplicaSessionFactory
 from src.adapters.uow import AsyncSqlAlchemyUnitOfWork
+from src.outbox.repository import OutboxRepository
 
 
 class EventsStorageUnitOfWork(AsyncSqlAlchemyUnitOfWork):
-    def __init__(self, session_factory: async_scoped_session[AsyncSession]) -> None:
-        super().__init__(session_factory)
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        read_session_factory: ReplicaSessionFactory | None = None,
+    ) -> None:
+        super().__init__(session_factory, read_session_factory)
 
     async def __aenter__(self) -> Self:
         uow = await super().__aenter__()
         self.events = EventsRepository(session=self.session)
         self.registrations = EventsRegistrationRepository(session=self.session)
+        self.waitlist = EventWaitlistRepository(session=self.session)
+        self.stats = EventStatsRepository(session=self.session)
+        self.outbox = OutboxRepository(session=self.session)
         return uow
\ No newline at end of file
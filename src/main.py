@@ -1,9 +1,16 @@
-from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+import logging
+import time
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import asynccontextmanager, contextmanager
 
 import uvicorn
 from fastapi import APIRouter, FastAPI
 
+from src.common.metrics import MetricsMiddleware
+from src.common.query_stats import QueryStatsMiddleware
+from src.common.routers.health_routers import health_router
+from src.common.routers.metrics_routers import metrics_router
+from src.config.base_config import settings
 from src.config.db_config import database_config as db_config
 from src.container import Container
 from src.events.exceptions.event_exc_handler import event_exception_handler
@@ -12,6 +19,9 @@ from src.users.exceptions.auth_exc_handler import auth_exception_handler
 from src.users.exceptions.user_exc_handler import user_exception_handler
 from src.users.routers.auth_routers import public_router
 from src.users.routers.users_routers import user_router
+from src.users.utils import password_hasher
+
+logger = logging.getLogger("uvicorn")
 
 exception_handlers = [
     user_exception_handler,
@@ -25,8 +35,20 @@ routers = [
     event_routers.public_router,
     event_routers.organizer_router,
     event_reg_routers.user_router,
+    health_router,
+    metrics_router,
 ]
 
+
+@contextmanager
+def _timed(timings: dict[str, float], phase: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = time.perf_counter() - started
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """
@@ -37,19 +59,42 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     :return: A context manager, which is used to manage the lifespan of a resource
     """
 
-    container: Container = Container()
-    app.container = container
-    container.check_dependencies()
+    timings: dict[str, float] = {}
+
+    with _timed(timings, "container"):
+        container: Container = Container()
+        app.container = container
+        container.check_dependencies()
 
     db = container.db_manager()
-    await db.connect(echo=db_config.DATABASE_ECHO)
-    await db.create_database()
-    db.init_session_factory()
+    with _timed(timings, "connect"):
+        await db.connect(echo=db_config.DATABASE_ECHO)
+        await db.ping()
+        db.init_session_factory()
+    with _timed(timings, "schema"):
+        schema = await db.ensure_schema()
+    with _timed(timings, "cache"):
+        await container.events_service().warm_cache()
+
+    app.state.startup_timings = timings
+    logger.info(
+        "Startup: "
+        + ", ".join(f"{phase} {seconds * 1000:.1f} ms" for phase, seconds in timings.items())
+        + f"; schema version {schema.version}"
+        + (f" (migrated from {schema.found_version})" if schema.migrated else "")
+    )
 
     yield
     await db.disconnect()
+    password_hasher.shutdown()
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(
+    QueryStatsMiddleware,
+    headers=settings.debug,
+    n_plus_one_threshold=db_config.DATABASE_N_PLUS_ONE_THRESHOLD,
+)
+app.add_middleware(MetricsMiddleware)
 router = APIRouter()
 
 for handler in exception_handlers:
@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Index, String, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.adapters.orm import SqlAlchemyBase, utc_now
+
+
+class OutboxMessage(SqlAlchemyBase):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Only undelivered messages are ever scanned by the worker.
+        Index(
+            "ix_email_outbox_pending",
+            "available_at",
+            "id",
+            postgresql_where=text("sent_at IS NULL"),
+            sqlite_where=text("sent_at IS NULL"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    subject: Mapped[str] = mapped_column(String(255))
+    recipients: Mapped[list[str]] = mapped_column(JSON)
+    template_name: Mapped[str] = mapped_column(String(255))
+    template_body: Mapped[dict[str, str]] = mapped_column(JSON)
+    attempts: Mapped[int] = mapped_column(default=0, server_default="0")
+    # When the message may be (re)tried: the retry time after a failure, or
+    # the end of the lease while a worker is sending it.
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    last_error: Mapped[str | None] = mapped_column(String(1000))
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+
+from src.adapters.email import EmailMessage
+from src.adapters.orm import utc_now
+from src.adapters.repository import AsyncRepository
+from src.outbox.orm import OutboxMessage
+from src.outbox.schemas import OutboxMessageModel
+
+
+class OutboxRepository(AsyncRepository[OutboxMessage, OutboxMessageModel]):
+    model = OutboxMessage
+    schema = OutboxMessageModel
+
+    async def enqueue(self, messages: list[EmailMessage]) -> None:
+        """
+        Queue messages for delivery. Call it inside the unit of work that makes
+        the change the messages are about, so both commit or neither does.
+        """
+        if messages:
+            await self.add_many(messages)
+
+    async def claim_batch(
+        self, limit: int, lease: timedelta, max_attempts: int
+    ) -> list[OutboxMessageModel]:
+        """
+        Lease up to `limit` due messages to the caller: they become invisible
+        to other workers until the lease runs out, so a crashed worker's batch
+        is picked up again later. On PostgreSQL, rows being claimed by another
+        worker are skipped instead of waited for.
+        """
+        now = utc_now()
+        due = (
+            select(self.model.id)
+            .where(
+                self.model.sent_at.is_(None),
+                self.model.available_at <= now,
+                self.model.attempts < max_attempts,
+            )
+            .order_by(self.model.available_at, self.model.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(due.scalar_subquery()))
+            .values(available_at=now + lease, attempts=self.model.attempts + 1)
+            .returning(*self._returning())
+        )
+        result = await self.session.execute(stmt)
+        return [self._to_schema(item) for item in self._rows(result)]
+
+    async def mark_sent(self, ids: list[int]) -> None:
+        if ids:
+            stmt = update(self.model).where(self.model.id.in_(ids)).values(sent_at=utc_now())
+            await self.session.execute(stmt)
+
+    async def mark_failed(self, id: int, error: str, retry_at: datetime) -> None:
+        stmt = (
+            update(self.model)
+            .where(self.model.id == id)
+            .values(available_at=retry_at, last_error=error[:1000])
+        )
+        await self.session.execute(stmt)
@@ -0,0 +1,11 @@
+from datetime import datetime
+
+from src.adapters.email import EmailMessage
+
+
+class OutboxMessageModel(EmailMessage):
+    id: int
+    attempts: int
+    available_at: datetime
+    sent_at: datetime | None
+    last_error: str | None
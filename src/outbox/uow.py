@@ -0,0 +1,16 @@
+from typing import Self
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.adapters.uow import AsyncSqlAlchemyUnitOfWork
+from src.outbox.repository import OutboxRepository
+
+
+class OutboxStorageUnitOfWork(AsyncSqlAlchemyUnitOfWork):
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        super().__init__(session_factory)
+
+    async def __aenter__(self) -> Self:
+        uow = await super().__aenter__()
+        self.outbox = OutboxRepository(session=self.session)
+        return uow
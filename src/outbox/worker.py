@@ -0,0 +1,132 @@
+"""
+Email outbox delivery worker.
+
+Drains the email_outbox table in batches, sending up to `concurrency` messages
+at a time over pooled SMTP connections, and retries failures with exponential
+backoff. Several workers can run side by side: each batch is leased to the
+worker that claimed it.
+
+    python -m src.outbox.worker
+"""
+import asyncio
+import logging
+import signal
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+
+from src.adapters.db.db_manager import AsyncDatabaseSQLAlchemyManager
+from src.adapters.email import EmailMessage, send_many, smtp_pool
+from src.adapters.orm import utc_now
+from src.config.base_config import settings
+from src.config.db_config import database_config as db_config
+from src.outbox.schemas import OutboxMessageModel
+from src.outbox.uow import OutboxStorageUnitOfWork
+
+logger = logging.getLogger("uvicorn")
+
+
+class OutboxWorker:
+    def __init__(
+        self,
+        uow: OutboxStorageUnitOfWork,
+        send: Callable[[list[EmailMessage], int], Awaitable[list[Exception | None]]] = send_many,
+        batch_size: int = settings.outbox_batch_size,
+        concurrency: int = settings.outbox_concurrency,
+        max_attempts: int = settings.outbox_max_attempts,
+        retry_base: float = settings.outbox_retry_base,
+        retry_max: float = settings.outbox_retry_max,
+        lease: float = settings.outbox_lease,
+        poll_interval: float = settings.outbox_poll_interval,
+    ) -> None:
+        self.uow = uow
+        self.send = send
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease = timedelta(seconds=lease)
+        self.poll_interval = poll_interval
+
+    async def run_once(self) -> int:
+        """
+        Claim one batch, send it and record the outcome. Returns the batch size.
+        """
+        async with self.uow:
+            batch = await self.uow.outbox.claim_batch(
+                self.batch_size, self.lease, self.max_attempts
+            )
+            await self.uow.commit()
+        if not batch:
+            return 0
+
+        errors = [
+            self._describe(message, error)
+            for message, error in zip(batch, await self.send(batch, self.concurrency))
+        ]
+
+        async with self.uow:
+            await self.uow.outbox.mark_sent(
+                [message.id for message, error in zip(batch, errors) if error is None]
+            )
+            for message, error in zip(batch, errors):
+                if error is not None:
+                    await self.uow.outbox.mark_failed(
+                        message.id, error, utc_now() + self._backoff(message.attempts)
+                    )
+            await self.uow.commit()
+        return len(batch)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """
+        Deliver until `stop` is set, sleeping between polls only when the
+        outbox has been drained.
+        """
+        while not stop.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                logger.exception("Outbox batch failed")
+                claimed = 0
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except TimeoutError:
+                    pass
+
+    def _describe(self, message: OutboxMessageModel, error: Exception | None) -> str | None:
+        if error is None:
+            return None
+        if message.attempts >= self.max_attempts:
+            logger.error("Giving up on outbox message %s: %s", message.id, error)
+        else:
+            logger.warning("Outbox message %s failed: %s", message.id, error)
+        return f"{type(error).__name__}: {error}"
+
+    def _backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.retry_base * 2 ** (attempts - 1), self.retry_max))
+
+
+async def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    db = AsyncDatabaseSQLAlchemyManager(db_config.GET_ASYNC_DB_URL)
+    await db.connect(echo=db_config.DATABASE_ECHO)
+    await db.ensure_schema()
+    db.init_session_factory()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    worker = OutboxWorker(OutboxStorageUnitOfWork(db.session_factory))
+    logger.info("Outbox worker started")
+    try:
+        await worker.run(stop)
+    finally:
+        await smtp_pool.close()
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
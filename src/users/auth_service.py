@@ -2,7 +2,7 @@ from src.users.uow import UsersStorageUnitOfWork
 from src.users.schemas import PrivateUser, TokenModel, UserCreate
 from src.users.exceptions import auth_exceptions as auth_err
 from src.users.exceptions import user_exceptions as user_err
-from src.users.utils import verify_password
+from src.users.utils import password_hasher
 
 
 class AuthUsersService:
@@ -30,11 +30,13 @@ class AuthUsersService:
             user: PrivateUser = await self.uow.users.get_one(email=email)
             if user is None:
                 raise auth_err.UserNotFoundUnAuthorizedError()
-            elif not verify_password(password, user.password):
-                raise auth_err.InvalidPasswordError()
 
-            access_token = await security_service.create_access_token(
-                data={"sub": user.email}
-            )
+        # Verified after the session is closed so bcrypt does not hold a connection.
+        if not await password_hasher.verify(password, user.password):
+            raise auth_err.InvalidPasswordError()
 
-            return TokenModel(access_token=access_token)
\ No newline at end of file
+        access_token = await security_service.create_access_token(
+            data=security_service.token_claims(user)
+        )
+
+        return TokenModel(access_token=access_token)
\ No newline at end of file
@@ -0,0 +1,17 @@
+import uuid
+
+from src.common.cache import TTLCache
+from src.config.base_config import settings
+from src.users.schemas import Principal
+
+# Authenticated principals keyed by the token subject (the user's email).
+principal_cache: TTLCache[str, Principal] = TTLCache(
+    maxsize=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl,
+)
+
+# Latest token version seen per user, used by the stateless auth mode.
+token_versions: TTLCache[uuid.UUID, int] = TTLCache(
+    maxsize=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl,
+)
@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING
 import uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import UUID, String
+from sqlalchemy import UUID, Index, String, func
 
 from src.adapters.orm import Role, SqlAlchemyBase
 
@@ -24,6 +24,11 @@ class User(SqlAlchemyBase):
     password: Mapped[str] = mapped_column(String(255))
     email: Mapped[str] = mapped_column(String(255), unique=True)
     role: Mapped[Role] = mapped_column(default=Role.user)
+    token_version: Mapped[int] = mapped_column(default=0, server_default="0")
 
     created_events: Mapped[list["Event"]] = relationship(back_populates="author", cascade="all, delete-orphan")
-    registrations: Mapped[list["EventRegistration"]] = relationship(back_populates="user")
\ No newline at end of file
+    registrations: Mapped[list["EventRegistration"]] = relationship(back_populates="user")
+
+
+# Case-insensitive email lookups, such as the attendee import.
+Index("ix_users_email_lower", func.lower(User.email))
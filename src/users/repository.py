@@ -1,3 +1,7 @@
+import uuid
+
+from sqlalchemy import select
+
 from src.adapters.repository import AsyncRepository
 from src.users.orm import User
 from src.users.schemas import PrivateUser
@@ -5,4 +9,9 @@ from src.users.schemas import PrivateUser
 
 class UsersRepository(AsyncRepository[User, PrivateUser]):
     model = User
-    schema = PrivateUser
\ No newline at end of file
+    schema = PrivateUser
+
+    async def get_token_version(self, user_id: uuid.UUID) -> int | None:
+        stmt = select(self.model.token_version).filter_by(user_id=user_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
@@ -15,7 +15,7 @@ from src.container import Container
 
 from src.users.auth_service import AuthUsersService
 from src.users.schemas import PrivateUser, TokenModel, UserCreate, UserResponse
-from src.users.utils import get_password_hash
+from src.users.utils import password_hasher
 
 public_router = APIRouter(prefix="/auth", tags=["Users: Authentication"])
 
@@ -41,7 +41,7 @@ async def signup_user(
     """
     ## Sign up a new user.
     """
-    body.password = get_password_hash(body.password)
+    body.password = await password_hasher.hash(body.password)
     new_user: PrivateUser = await auth_user_service.create_user(body)
 
     return new_user
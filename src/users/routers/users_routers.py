@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, status
 
 from src.common.security import security_service as auth_service
 from src.container import Container
-from src.users.schemas import PrivateUser, UserResponse, UserUpdate
+from src.users.schemas import Principal, UserResponse, UserUpdate
 from src.users.service import UsersService
 
 user_router = APIRouter(prefix="/users", tags=["Users: Profile"])
@@ -22,7 +22,7 @@ user_router = APIRouter(prefix="/users", tags=["Users: Profile"])
 @inject
 async def read_me(
     users_service: UsersService = Depends(Provide(Container.users_service)),
-    current_user: PrivateUser = Depends(auth_service.get_current_user),
+    current_user: Principal = Depends(auth_service.get_current_user),
 ) -> UserResponse:
     """
     ## Get Current User Profile
@@ -33,6 +33,30 @@ async def read_me(
     return user
 
 
+@user_router.post(
+    "/me/revoke_tokens",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        status.HTTP_204_NO_CONTENT: {
+            "description": "Every access token issued so far is revoked.",
+        },
+    },
+)
+@inject
+async def revoke_tokens(
+    users_service: UsersService = Depends(Provide(Container.users_service)),
+    current_user: Principal = Depends(auth_service.get_current_user),
+) -> None:
+    """
+    ## Revoke Access Tokens
+
+    Takes effect for tokens issued in stateless auth mode, which carry a token version.
+    """
+    await users_service.revoke_tokens(current_user.user_id)
+
+    return None
+
+
 @user_router.put(
     "/{user_id}",
     response_model=UserResponse,
@@ -50,6 +50,17 @@ class UserResponse(UserBase):
 class PrivateUser(UserResponse):
     model_config = ConfigDict(from_attributes=True)
     password: str
+    token_version: int = 0
+
+
+class Principal(BaseModel):
+    """The authenticated caller, as seen by protected routes."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    user_id: uuid.UUID
+    email: EmailStr
+    role: Role
 
 
 class UserUpdate(BaseModel):
@@ -1,4 +1,6 @@
 import uuid
+from src.users.cache import principal_cache, token_versions
+from src.users.orm import User
 from src.users.uow import UsersStorageUnitOfWork
 from src.users.schemas import PrivateUser, UserUpdate
 from src.users.exceptions import user_exceptions as user_err
@@ -9,7 +11,7 @@ class UsersService:
         self.uow = uow
 
     async def get_user_by_id(self, user_id: uuid.UUID) -> PrivateUser:
-        async with self.uow:
+        async with self.uow.read_only():
             user: PrivateUser | None = await self.uow.users.get_one(user_id=user_id)
             if user is None:
                 raise user_err.UserNotFoundError()
@@ -22,6 +24,8 @@ class UsersService:
                 raise user_err.UserNotFoundError()
             updated_user = await self.uow.users.update_one(body, user_id=user_id)
             await self.uow.commit()
+        principal_cache.pop(user.email)
+        token_versions.pop(user.user_id)
         return updated_user
         
     async def delete_user(self, user_id: uuid.UUID) -> None:
@@ -32,4 +36,19 @@ class UsersService:
                 raise user_err.UserNotFoundError()
             await self.uow.users.delete_one(user_id=user.user_id)
 
-            await self.uow.commit()
\ No newline at end of file
+            await self.uow.commit()
+        principal_cache.pop(user.email)
+        token_versions.pop(user.user_id)
+
+    async def revoke_tokens(self, user_id: uuid.UUID) -> None:
+        """
+        Invalidate every access token issued to the user so far by bumping
+        their token version.
+        """
+        async with self.uow:
+            user: PrivateUser | None = await self.uow.users.update_one(
+                {"token_version": User.token_version + 1}, user_id=user_id
+            )
+            await self.uow.commit()
+        principal_cache.pop(user.email)
+        token_versions.pop(user_id)
\ No newline at end of file
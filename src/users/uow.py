@@ -1,14 +1,19 @@
 from typing import Self
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from src.adapters.db.replica import ReplicaSessionFactory
 from src.adapters.uow import AsyncSqlAlchemyUnitOfWork
 from src.users.repository import UsersRepository
 
 
 class UsersStorageUnitOfWork(AsyncSqlAlchemyUnitOfWork):
-    def __init__(self, session_factory: async_scoped_session[AsyncSession]) -> None:
-        super().__init__(session_factory)
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        read_session_factory: ReplicaSessionFactory | None = None,
+    ) -> None:
+        super().__init__(session_factory, read_session_factory)
 
     async def __aenter__(self) -> Self:
         uow = await super().__aenter__()
@@ -1,13 +1,26 @@
+import asyncio
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
 from passlib.context import CryptContext
 
+from src.common.metrics import password_hash_duration
+from src.config.base_config import HashExecutor, settings
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+T = TypeVar("T")
+
 
-def verify_password(plain_password: str, hashed_password: str) -> CryptContext:
+def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify that the plain-text password matches the hashed password.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return bool(pwd_context.verify(plain_password, hashed_password))
 
 
 def get_password_hash(password: str) -> str:
@@ -15,3 +28,93 @@ def get_password_hash(password: str) -> str:
     Get the hash of the password.
     """
     return str(pwd_context.hash(password))
+
+
+@dataclass
+class PasswordHasherStats:
+    calls: int = 0
+    in_flight: int = 0
+    waiting: int = 0
+    queue_wait_seconds_total: float = 0.0
+    queue_wait_seconds_max: float = 0.0
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a worker pool so they never block
+    the event loop. At most `max_concurrency` calls run at once; the rest wait
+    in a queue, and the time spent there is recorded in `stats`.
+    """
+
+    def __init__(
+        self,
+        executor: HashExecutor = HashExecutor.thread,
+        max_workers: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> None:
+        self._executor_kind = executor
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._max_concurrency = max_concurrency
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self.stats = PasswordHasherStats()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._executor_kind == HashExecutor.process:
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency or self._max_workers)
+        return self._semaphore
+
+    async def _run(self, operation: str, fn: Callable[..., T], *args: Any) -> T:
+        semaphore = self._get_semaphore()
+        queued_at = time.perf_counter()
+        self.stats.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            # Also when the caller is cancelled while still queued.
+            self.stats.waiting -= 1
+        try:
+            waited = time.perf_counter() - queued_at
+            self.stats.calls += 1
+            self.stats.queue_wait_seconds_total += waited
+            self.stats.queue_wait_seconds_max = max(self.stats.queue_wait_seconds_max, waited)
+
+            self.stats.in_flight += 1
+            started = time.perf_counter()
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._get_executor(), fn, *args)
+            finally:
+                self.stats.in_flight -= 1
+                password_hash_duration.labels(operation).observe(time.perf_counter() - started)
+        finally:
+            semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run("verify", verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._semaphore = None
+
+
+password_hasher = PasswordHasher(
+    executor=settings.password_hash_executor,
+    max_workers=settings.password_hash_workers,
+    max_concurrency=settings.password_hash_max_concurrency,
+)